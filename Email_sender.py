@@ -1,9 +1,14 @@
+import sys
+import uuid
 from typing import Annotated
 from dotenv import load_dotenv
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from agentsync.AgentCreator import AgentCreator
 from agentsync.SupervisorCreator import SupervisorCreator
+from agentsync.checkpoint import run_or_resume, sqlite_checkpointer
 from agentsync.tools.gmail_tool import GmailTool
+from agentsync.tools.idempotency import idempotency_key
 from langchain_openai import ChatOpenAI
 from prompt import EMAIL_CREATOR_PROMPT, SUPERVISOR_PROMPT
 
@@ -17,7 +22,8 @@ model = ChatOpenAI(model="gpt-3.5-turbo")
 def send_email(
     recipient: Annotated[str, "this is the recipient mail address."],
     subject: Annotated[str, "this is the subject of email"],
-    content: Annotated[str, "content of the email which generated from llm"]
+    content: Annotated[str, "content of the email which generated from llm"],
+    config: RunnableConfig
 ) -> str:
     """Sends the mail to specific recipient.content will be the  supervisor's agent generated mail.
     after execution output should be the email content and the message is it success or fail.
@@ -25,8 +31,12 @@ def send_email(
     # Assuming AgentB can send emails
     gmail = GmailTool()
 
+    # A resumed run replays this call with the same key and does not send twice
+    thread_id = config.get("configurable", {}).get("thread_id")
+    key = idempotency_key(thread_id, "send_email", recipient, subject, content) if thread_id else None
+
     # Define email details
-    if gmail.send_email(recipient, subject, content):
+    if gmail.send_email(recipient, subject, content, idempotency_key=key):
         return f"{content}\n\n📩 Final email sent to {recipient} successfully."
     else:
         return f"❌ Failed to send final email to {recipient}."
@@ -50,11 +60,13 @@ def main():
         model=model,
         tools=[],
         prompt=SUPERVISOR_PROMPT,
-        output_mode="last_message"
+        output_mode="last_message",
+        checkpointer=sqlite_checkpointer()
     )
     
-    # Compile the workflow
-    app = supervisor.compile()
+    # The workflow is compiled with a checkpointer; pass the thread id of an interrupted run to resume it
+    app = supervisor
+    thread_id = sys.argv[1] if len(sys.argv) > 1 else str(uuid.uuid4())
     
     # Example user message to send an email
 
@@ -68,8 +80,8 @@ def main():
         ]
     }
     # Invoke the app with the user message
-    print("Running Email generation Automation...")
-    result = app.invoke(user_message)
+    print(f"Running Email generation Automation (thread {thread_id})...")
+    result = run_or_resume(app, user_message, thread_id)
 
     # Print the summary
     print("\nEmail generation Execution Completed. Summary:")
@@ -1,6 +1,11 @@
 from langchain_core.tools import BaseTool
 from langgraph.prebuilt import create_react_agent
 from typing import List, Optional, Any
+from langchain_core.caches import BaseCache
+from agentsync.compaction import MessageCompactor
+from agentsync.graph_cache import GraphCache
+from agentsync.llm_cache import with_llm_cache
+from agentsync.tools.memoize import ToolCache, get_tool_cache
 
 class AgentCreator:
     """
@@ -10,9 +15,15 @@ class AgentCreator:
     customizable models, tools, prompts, and other parameters.
     """
     
-    def __init__(self):
-        """Initialize the AgentCreator."""
-        pass
+    def __init__(self, cache: Optional[GraphCache] = None):
+        """
+        Initialize the AgentCreator.
+        
+        Args:
+            cache: Optional GraphCache; identical configurations then return
+                the same agent instead of building a new one.
+        """
+        self.cache = cache
         
     def create_agent(
         self,
@@ -20,6 +31,9 @@ class AgentCreator:
         tools: List[BaseTool] = None,
         name: str = "default_agent",
         prompt: str = None,
+        llm_cache: Optional[BaseCache] = None,
+        compaction: Optional[MessageCompactor] = None,
+        tool_cache: Optional[ToolCache] = None,
         **kwargs
     ):
         """
@@ -30,6 +44,11 @@ class AgentCreator:
             tools: A list of tools the agent can use.
             name: The name of the agent.
             prompt: The system prompt for the agent.
+            llm_cache: Optional LLM response cache, e.g. SQLiteLLMCache, used by this agent's model.
+            compaction: Optional MessageCompactor fitting the history sent with each call to a token budget.
+            tool_cache: Optional ToolCache memoizing read-only tools by their policy or, failing that,
+                their name (see DEFAULT_POLICIES). Without it, only tools marked with ``cacheable``
+                are memoized, in the shared cache.
             **kwargs: Additional arguments to pass to the agent executor.
             
         Returns:
@@ -45,13 +64,23 @@ class AgentCreator:
             You have access to the following tools: {[tool.name for tool in tools]}.
             Use these tools when appropriate to complete user requests."""
         
+        model = with_llm_cache(model, llm_cache)
+        agent_prompt = compaction.as_prompt(prompt) if compaction is not None else prompt
+        
         # Create the agent
-        agent = create_react_agent(
-            model=model,
-            tools=tools,
-            name=name,
-            prompt=prompt
-        )
+        def build():
+            # Wrapped here so a GraphCache hit reuses the wrapped tools of the cached agent
+            agent_tools = (tool_cache or get_tool_cache()).wrap_tools(tools, marked_only=tool_cache is None)
+            return create_react_agent(
+                model=model,
+                tools=agent_tools,
+                name=name,
+                prompt=agent_prompt
+            )
+        
+        if self.cache is not None:
+            return self.cache.get_or_build(build, kind="agent", model=model, tools=tools, name=name, prompt=prompt,
+                                         llm_cache=llm_cache, compaction=compaction, tool_cache=tool_cache)
         
         # Create and return the agent executor
-        return agent
\ No newline at end of file
+        return build()
\ No newline at end of file
@@ -1,8 +1,17 @@
-from langchain_openai import ChatOpenAI
 from langgraph_supervisor import create_supervisor
+from langchain_core.caches import BaseCache
 from langchain_core.tools import BaseTool
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Any
 import logging
+from agentsync.compaction import MessageCompactor
+from agentsync.graph_cache import GraphCache
+from agentsync.llm_cache import with_llm_cache
+from agentsync.parallel_delegation import (
+    DEFAULT_BRANCH_TIMEOUT,
+    DEFAULT_MAX_PARALLEL_BRANCHES,
+    PARALLEL_TOOL_NAME,
+    create_parallel_delegation_tool,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +23,15 @@ class SupervisorCreator:
     customizable models, agents, tools, prompts, and other parameters.
     """
     
-    def __init__(self):
-        """Initialize the SupervisorCreator."""
-        pass
+    def __init__(self, cache: Optional[GraphCache] = None):
+        """
+        Initialize the SupervisorCreator.
+        
+        Args:
+            cache: Optional GraphCache; identical configurations then return
+                the same workflow instead of building a new one.
+        """
+        self.cache = cache
         
     def create_supervisor(
         self,
@@ -25,7 +40,13 @@ class SupervisorCreator:
         tools: List[BaseTool] = None,
         prompt: str = None,
         output_mode: str = "last_message",
-
+        compile: bool = False,
+        parallel: bool = False,
+        max_parallel_branches: int = DEFAULT_MAX_PARALLEL_BRANCHES,
+        branch_timeout: Optional[float] = DEFAULT_BRANCH_TIMEOUT,
+        llm_cache: Optional[BaseCache] = None,
+        compaction: Optional[MessageCompactor] = None,
+        checkpointer: Optional[Any] = None,
     ):
         """
         Create a LangGraph supervisor with the specified configuration.
@@ -36,8 +57,19 @@ class SupervisorCreator:
             tools: A list of supervisor-level tools.
             prompt: The system prompt for the supervisor.
             output_mode: Output mode for the supervisor ("last_message" or "full_trace").            
+            compile: Return the compiled workflow instead of the graph builder.
+                With a cache, this is what makes repeated calls skip compilation.
+            parallel: Give the supervisor a tool that runs several agents
+                concurrently on independent subtasks and joins their answers.
+            max_parallel_branches: Maximum number of agents running at once in parallel mode.
+            branch_timeout: Seconds an agent may run in parallel mode, or None for no limit.
+            llm_cache: Optional LLM response cache, e.g. SQLiteLLMCache, used by the supervisor's model.
+            compaction: Optional MessageCompactor fitting the history sent with each supervisor call
+                to a token budget; useful with output_mode="full_history".
+            checkpointer: Optional LangGraph checkpointer, e.g. ``sqlite_checkpointer()``,
+                making runs resumable per thread_id. Implies ``compile``.
         Returns:
-            A compiled supervisor workflow.
+            A supervisor workflow, compiled if ``compile`` is set.
         """
         # Initialize default values
         if tools is None:
@@ -47,6 +79,9 @@ class SupervisorCreator:
         # print("agent_names: ",agent_names)
         # Set default system prompt if not provided
         if prompt is None:
+            parallel_hint = ""
+            if parallel:
+                parallel_hint = f"When subtasks are independent, run them at the same time with {PARALLEL_TOOL_NAME}.\n            "
             prompt = f"""You are a supervisor responsible for coordinating the following agents: {agent_names}.
             
             Each agent has specialized capabilities:
@@ -58,20 +93,40 @@ class SupervisorCreator:
             3. Integrate their results
             4. Provide a coherent response to the user
             
-            Use the available tools when appropriate and ensure the workflow proceeds efficiently."""
+            {parallel_hint}Use the available tools when appropriate and ensure the workflow proceeds efficiently."""
         
-        try:
+        model = with_llm_cache(model, llm_cache)
+        compile = compile or checkpointer is not None
+        supervisor_prompt = compaction.as_prompt(prompt) if compaction is not None else prompt
+        
+        def build():
+            # Built here rather than up front: each delegation tool wraps a new function,
+            # so it would give every call a new fingerprint
+            supervisor_tools = tools
+            if parallel:
+                supervisor_tools = tools + [create_parallel_delegation_tool(agents, max_parallel_branches, branch_timeout)]
+
             # Create the supervisor
             supervisor = create_supervisor(
                 agents=agents,
                 model=model,
-                tools=tools,
-                prompt=prompt,
+                tools=supervisor_tools,
+                prompt=supervisor_prompt,
                 output_mode=output_mode
             )
             
             # Compile the workflow
-            return supervisor
+            return supervisor.compile(checkpointer=checkpointer) if compile else supervisor
+        
+        try:
+            if self.cache is not None:
+                return self.cache.get_or_build(
+                    build, kind="supervisor", agents=agents, model=model, tools=tools,
+                    prompt=prompt, output_mode=output_mode, compile=compile, parallel=parallel,
+                    max_parallel_branches=max_parallel_branches, branch_timeout=branch_timeout,
+                    llm_cache=llm_cache, compaction=compaction, checkpointer=checkpointer
+                )
+            return build()
             
         except Exception as e:
             logger.error(f"Error creating supervisor: {str(e)}")
@@ -0,0 +1,95 @@
+import os
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+import agentsync.config as settings
+
+
+def sqlite_checkpointer(path: Optional[str] = None):
+    """
+    Return a LangGraph SqliteSaver persisting workflow checkpoints to disk.
+
+    Pass it to ``SupervisorCreator.create_supervisor(checkpointer=...)``; every
+    completed step of a thread is then saved, so a crashed run can be resumed
+    with ``run_or_resume`` instead of starting over. The saver supports the
+    synchronous API (``invoke``/``stream``) only; async runs, including
+    WorkflowRunner, need ``async_sqlite_checkpointer``.
+
+    Args:
+        path: Location of the sqlite file; CHECKPOINT_FILE by default.
+    """
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    path = path or settings.CHECKPOINT_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return SqliteSaver(conn)
+
+
+@asynccontextmanager
+async def async_sqlite_checkpointer(path: Optional[str] = None) -> AsyncIterator[Any]:
+    """
+    Async variant of ``sqlite_checkpointer`` for ``ainvoke``/``astream`` and WorkflowRunner.
+
+    The connection lives as long as the context, so build and run the
+    workflow inside it::
+
+        async with async_sqlite_checkpointer() as checkpointer:
+            app = SupervisorCreator().create_supervisor(..., checkpointer=checkpointer)
+            await WorkflowRunner(app).arun("jobs.jsonl")
+
+    Args:
+        path: Location of the sqlite file; CHECKPOINT_FILE by default.
+    """
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    path = path or settings.CHECKPOINT_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(path) as checkpointer:
+        await checkpointer.conn.execute("PRAGMA journal_mode=WAL")
+        yield checkpointer
+
+
+def is_sync_only(checkpointer: Any) -> bool:
+    """Whether a checkpointer raises on the async API, like the sync SqliteSaver."""
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        return False
+    return isinstance(checkpointer, SqliteSaver)
+
+
+def thread_config(thread_id: str, config: Optional[dict] = None) -> dict:
+    """Return a run config addressing the checkpoint thread ``thread_id``."""
+    config = dict(config or {})
+    config["configurable"] = {**config.get("configurable", {}), "thread_id": thread_id}
+    return config
+
+
+def run_or_resume(app: Any, input: Any, thread_id: str, config: Optional[dict] = None) -> dict:
+    """
+    Run a checkpointed workflow on a thread, resuming it if it was interrupted.
+
+    A thread with pending steps continues from its last completed step
+    without re-running earlier LLM calls or tools; a finished thread returns
+    its final state; a new thread starts with ``input``.
+
+    Args:
+        app: Workflow compiled with a checkpointer.
+        input: Input for a new run, e.g. ``{"messages": [...]}``.
+        thread_id: Identifier of the run, reused to resume it.
+        config: Optional extra run config.
+
+    Returns:
+        The final state of the workflow.
+    """
+    config = thread_config(thread_id, config)
+    state = app.get_state(config)
+    if state.next:
+        print(f"⚠️ Resuming thread {thread_id} at {', '.join(state.next)}")
+        return app.invoke(None, config)
+    if state.values:
+        print(f"✅ Thread {thread_id} already completed")
+        return state.values
+    return app.invoke(input, config)
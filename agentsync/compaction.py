@@ -0,0 +1,179 @@
+import json
+import threading
+from typing import Callable, List, Optional, Sequence
+from cachetools import LRUCache
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from agentsync.tools.passage_ranker import count_tokens
+
+# Default token budget for the messages sent with each LLM call
+DEFAULT_MAX_TOKENS = 8000
+# Default number of most recent messages that are never trimmed or dropped
+DEFAULT_KEEP_RECENT = 6
+# Characters kept from an old tool output when it is trimmed
+DEFAULT_TOOL_OUTPUT_CHARS = 500
+# Approximate per-message overhead of role markers in chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "Summarize the following earlier part of a conversation between a user, an assistant and its tools. "
+    "Keep names, email addresses, IDs, decisions and results that later steps may need. Be concise.\n\n{transcript}"
+)
+
+
+class MessageCompactor:
+    """
+    Shrinks a message history to a token budget before each LLM call.
+
+    Leading system messages, the first human message (the original
+    instruction) and the last ``keep_recent`` messages are always sent
+    unchanged. If the history is over budget, older tool outputs are trimmed
+    first; if that is not enough, the oldest other messages are dropped, an
+    AI message and the tool results answering its calls always together. A
+    short note or, with a ``summarizer``, a summary of what was dropped is
+    appended to the leading system prompt, since several providers reject
+    system messages later in the conversation. The graph state itself is
+    never modified.
+    """
+
+    def __init__(self, max_tokens: int = DEFAULT_MAX_TOKENS, keep_recent: int = DEFAULT_KEEP_RECENT,
+                 tool_output_chars: int = DEFAULT_TOOL_OUTPUT_CHARS,
+                 summarizer: Optional[Callable[[List[BaseMessage]], str]] = None):
+        """
+        Args:
+            max_tokens: Token budget for the messages of one call.
+            keep_recent: Number of most recent messages always kept intact.
+            tool_output_chars: Characters kept from each trimmed tool output.
+            summarizer: Optional function summarizing dropped messages, e.g. ``llm_summarizer(model)``.
+        """
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.tool_output_chars = tool_output_chars
+        self.summarizer = summarizer
+        self._token_counts = LRUCache(maxsize=4096)
+        self._summaries = LRUCache(maxsize=256)
+        self._lock = threading.Lock()
+
+    def compact(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """Return ``messages`` reduced to fit ``max_tokens`` where possible."""
+        messages = list(messages)
+        if self.count(messages) <= self.max_tokens:
+            return messages
+
+        start = 0
+        while start < len(messages) and isinstance(messages[start], SystemMessage):
+            start += 1
+        head = messages[:start]
+        recent_start = max(start, len(messages) - self.keep_recent)
+        # Never open the recent window on tool results whose call would be cut off
+        while recent_start > start and isinstance(messages[recent_start], ToolMessage):
+            recent_start -= 1
+        old = [self._trim_tool_output(message) for message in messages[start:recent_start]]
+        recent = messages[recent_start:]
+        # The original instruction is never dropped
+        instruction = next((message for message in old if isinstance(message, HumanMessage)), None)
+        pinned = []
+        if instruction is not None:
+            old.remove(instruction)
+            pinned = [instruction]
+
+        fixed = self.count(head) + self.count(pinned) + self.count(recent)
+        groups = _group_tool_calls(old)
+        kept = sum(self.count(group) for group in groups)
+        dropped = []
+        while groups and fixed + kept > self.max_tokens:
+            group = groups.pop(0)
+            kept -= self.count(group)
+            dropped.extend(group)
+
+        if not dropped:
+            return head + pinned + old + recent
+        return _with_note(head, self._summarize(dropped)) + pinned + [message for group in groups for message in group] + recent
+
+    def as_prompt(self, prompt: Optional[str] = None) -> Callable[[dict], List[BaseMessage]]:
+        """
+        Return a ``create_react_agent`` prompt callable applying the system prompt and compaction.
+
+        Args:
+            prompt: System prompt placed before the compacted history.
+        """
+        system = [SystemMessage(content=prompt)] if prompt else []
+
+        def compacted_prompt(state):
+            return self.compact(system + list(state["messages"]))
+
+        return compacted_prompt
+
+    def count(self, messages: Sequence[BaseMessage]) -> int:
+        """Approximate number of tokens the messages take in a request."""
+        return sum(self._count_one(message) for message in messages)
+
+    def _count_one(self, message):
+        key = (message.id, len(str(message.content))) if message.id else None
+        if key is not None:
+            with self._lock:
+                cached = self._token_counts.get(key)
+            if cached is not None:
+                return cached
+        tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(_message_text(message))
+        if isinstance(message, AIMessage) and message.tool_calls:
+            tokens += count_tokens(json.dumps([call["args"] for call in message.tool_calls], default=str))
+        if key is not None:
+            with self._lock:
+                self._token_counts[key] = tokens
+        return tokens
+
+    def _trim_tool_output(self, message):
+        if not isinstance(message, ToolMessage):
+            return message
+        text = _message_text(message)
+        if len(text) <= self.tool_output_chars:
+            return message
+        trimmed = f"{text[:self.tool_output_chars]}\n[... {len(text) - self.tool_output_chars} characters of tool output trimmed]"
+        return message.model_copy(update={"content": trimmed})
+
+    def _summarize(self, dropped):
+        if self.summarizer is None:
+            return f"[{len(dropped)} earlier messages were omitted to fit the context budget.]"
+        # The same prefix is dropped on every later call of a run; summarize it once
+        key = tuple(message.id or id(message) for message in dropped)
+        with self._lock:
+            summary = self._summaries.get(key)
+        if summary is None:
+            summary = self.summarizer(dropped)
+            with self._lock:
+                self._summaries[key] = summary
+        return f"Summary of earlier conversation:\n{summary}"
+
+
+def llm_summarizer(model) -> Callable[[List[BaseMessage]], str]:
+    """Return a summarizer for MessageCompactor that asks ``model`` (ideally a cheap one) for a summary."""
+    def summarize(messages):
+        transcript = "\n".join(f"{message.type}: {_message_text(message)}" for message in messages)
+        return _message_text(model.invoke(SUMMARY_PROMPT.format(transcript=transcript)))
+
+    return summarize
+
+
+def _with_note(head, note):
+    """Append the note to the last leading system message, or make it the system prompt."""
+    if head and isinstance(head[-1].content, str):
+        return head[:-1] + [head[-1].model_copy(update={"content": f"{head[-1].content}\n\n{note}"})]
+    return head + [SystemMessage(content=note)]
+
+
+def _group_tool_calls(messages):
+    """Group each AI message with the tool results answering it, so they are dropped together."""
+    groups = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and groups:
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+
+def _message_text(message):
+    content = message.content
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content
@@ -1,5 +1,6 @@
 import os
-from dotenv import load_dotenv
+import sys
+import threading
 
 # Dynamically get the root directory based on where the user runs the script
 PROJECT_ROOT = os.getcwd()
@@ -7,32 +8,89 @@ PROJECT_ROOT = os.getcwd()
 # Define expected locations of .env and credentials
 ENV_FILE = os.path.join(PROJECT_ROOT, ".env")
 CRED_DIR = os.path.join(PROJECT_ROOT, "cred_files/")
+STATE_DIR = os.path.join(PROJECT_ROOT, "state_files/")
 
-# Load environment variables from .env if it exists
-if os.path.exists(ENV_FILE):
-    load_dotenv(ENV_FILE)
-else:
-    print(f"⚠️ Warning: No .env file found at {ENV_FILE}. Using system environment variables.")
-
-# Access environment variables, default to empty strings if missing
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
-GOOGLE_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE", os.path.join(CRED_DIR, "google_service_cred.json"))
-CLIENT_SECRET_FILE = os.getenv("CLIENT_SECRET_FILE", os.path.join(CRED_DIR, "client_secret.json"))
-SHEET_ID = os.getenv("SHEET_ID", "")
-GMAIL_USER_EMAIL = os.getenv("GMAIL_USER_EMAIL", "")
-HUNTER_API_KEY = os.getenv("HUNTER_API_KEY", "")
-CHECK_INTERVAL = int(os.getenv("CHECK_INTERVAL", 60))
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-
-# Validate credentials existence
-if not GOOGLE_API_KEY:
-    print("⚠️ Warning: GOOGLE_API_KEY is not set.")
-
-if not OPENAI_API_KEY:
-    print("⚠️ Warning: OPENAI_API_KEY is not set.")
-
-if not os.path.exists(GOOGLE_CREDENTIALS_FILE):
-    print(f"⚠️ Warning: Google credentials file not found at {GOOGLE_CREDENTIALS_FILE}")
-
-if not os.path.exists(CLIENT_SECRET_FILE):
-    print(f"⚠️ Warning: Client secret file not found at {CLIENT_SECRET_FILE}")
+# Settings read from environment variables of the same name, with their defaults.
+# They are resolved on first access, so importing this module costs nothing.
+DEFAULTS = {
+    "GOOGLE_API_KEY": "",
+    "GOOGLE_CREDENTIALS_FILE": os.path.join(CRED_DIR, "google_service_cred.json"),
+    "CLIENT_SECRET_FILE": os.path.join(CRED_DIR, "client_secret.json"),
+    "SHEET_ID": "",
+    "GMAIL_USER_EMAIL": "",
+    "HUNTER_API_KEY": "",
+    "CHECK_INTERVAL": 60,
+    "OPENAI_API_KEY": "",
+    "GMAIL_SYNC_STATE_FILE": os.path.join(STATE_DIR, "gmail_sync_state.json"),
+    "SERPAPI_KEY": "",
+    # Optional sqlite tier for the shared search cache; memory-only when empty
+    "SEARCH_CACHE_FILE": "",
+    "HTTP_CACHE_FILE": os.path.join(STATE_DIR, "http_cache.sqlite"),
+    "CALENDAR_STORE_FILE": os.path.join(STATE_DIR, "calendar_store.json"),
+    "EMAIL_VERIFICATION_CACHE_FILE": os.path.join(STATE_DIR, "email_verification.sqlite"),
+    "LLM_CACHE_FILE": os.path.join(STATE_DIR, "llm_cache.sqlite"),
+    "CHECKPOINT_FILE": os.path.join(STATE_DIR, "checkpoints.sqlite"),
+    "IDEMPOTENCY_FILE": os.path.join(STATE_DIR, "idempotency.sqlite"),
+    "TOOL_CACHE_FILE": os.path.join(STATE_DIR, "tool_cache.sqlite"),
+}
+
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def load():
+    """Load the .env file and validate credentials; only the first call does any work."""
+    global _loaded
+    with _load_lock:
+        if _loaded:
+            return
+        _loaded = True
+
+        # Load environment variables from .env if it exists
+        if os.path.exists(ENV_FILE):
+            from dotenv import load_dotenv
+            load_dotenv(ENV_FILE)
+        else:
+            print(f"⚠️ Warning: No .env file found at {ENV_FILE}. Using system environment variables.")
+
+        # Validate credentials existence
+        if not _resolve("GOOGLE_API_KEY"):
+            print("⚠️ Warning: GOOGLE_API_KEY is not set.")
+
+        if not _resolve("OPENAI_API_KEY"):
+            print("⚠️ Warning: OPENAI_API_KEY is not set.")
+
+        if not os.path.exists(_resolve("GOOGLE_CREDENTIALS_FILE")):
+            print(f"⚠️ Warning: Google credentials file not found at {_resolve('GOOGLE_CREDENTIALS_FILE')}")
+
+        if not os.path.exists(_resolve("CLIENT_SECRET_FILE")):
+            print(f"⚠️ Warning: Client secret file not found at {_resolve('CLIENT_SECRET_FILE')}")
+
+
+def _resolve(name):
+    default = DEFAULTS[name]
+    value = os.getenv(name)
+    return default if value is None else type(default)(value)
+
+
+def __getattr__(name):
+    if name not in DEFAULTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    load()
+    # Cache on the module so later lookups skip this hook
+    value = globals()[name] = _resolve(name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(DEFAULTS))
+
+
+def main():
+    """Print the resolved settings (entry point of the ``agentsync`` command)."""
+    module = sys.modules[__name__]
+    for name in DEFAULTS:
+        value = getattr(module, name)
+        if name.endswith("_KEY") and value:
+            value = f"{value[:4]}…"
+        print(f"{name}: {value}")
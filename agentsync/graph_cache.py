@@ -0,0 +1,222 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Default number of built graphs kept before the least recently used is dropped
+DEFAULT_MAX_GRAPHS = 32
+# Model attributes selecting the endpoint and account, absent from _identifying_params
+MODEL_CLIENT_FIELDS = (
+    "openai_api_base", "base_url", "azure_endpoint", "openai_organization", "organization",
+    "openai_proxy", "default_headers", "default_query", "openai_api_key", "api_key",
+    "anthropic_api_url", "anthropic_api_key", "google_api_key",
+)
+
+
+def fingerprint(**parts) -> str:
+    """
+    Return a stable hash of an agent or supervisor configuration.
+
+    Models are described by their class, identifying parameters and client
+    settings (endpoint, organization and a hash of the API key), tools by name,
+    description and the identity of their function, prompts by their text and
+    module-level functions by qualified name, so equivalent configurations
+    share a fingerprint. Other objects (e.g. already built agents, closures)
+    are identified by identity.
+    """
+    return _fingerprint(parts)[0]
+
+
+def _fingerprint(parts):
+    refs = []
+    payload = json.dumps(_describe(parts, refs), sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest(), refs
+
+
+def _describe(value, refs):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): _describe(item, refs) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_describe(item, refs) for item in value]
+
+    kind = f"{type(value).__module__}.{type(value).__qualname__}"
+    params = getattr(value, "_identifying_params", None)
+    if isinstance(params, dict):
+        # Chat models: class plus model name, temperature, ... and where requests go
+        return [kind, _describe(params, refs), _describe_client(value, refs)]
+    if hasattr(value, "name") and hasattr(value, "description") and hasattr(value, "args_schema"):
+        # Tools of the same name may wrap different functions (e.g. closures over different accounts)
+        func = getattr(value, "func", None)
+        coroutine = getattr(value, "coroutine", None)
+        if func is None and coroutine is None:
+            return _identity(value, kind, refs)
+        return [kind, value.name, value.description, _identity(func, "func", refs), _identity(coroutine, "coroutine", refs)]
+    if hasattr(value, "content") and hasattr(value, "type"):
+        # Messages, e.g. a SystemMessage prompt
+        return [kind, value.type, _describe(value.content, refs)]
+    if callable(value) and hasattr(value, "__qualname__") and not getattr(value, "__closure__", None):
+        return [kind, f"{value.__module__}.{value.__qualname__}"]
+    return _identity(value, kind, refs)
+
+
+def _describe_client(model, refs):
+    client = {}
+    for field in MODEL_CLIENT_FIELDS:
+        value = getattr(model, field, None)
+        if value is None:
+            continue
+        if hasattr(value, "get_secret_value"):
+            # Never put the key itself into the payload
+            value = hashlib.blake2b(value.get_secret_value().encode("utf-8"), digest_size=8).hexdigest()
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            value = _identity(value, type(value).__qualname__, refs)
+        client[field] = value
+    return client
+
+
+def _identity(value, kind, refs):
+    """Describe an object by identity; the cache entry holds a reference so the id is not reused."""
+    if value is None:
+        return None
+    refs.append(value)
+    return [kind, getattr(value, "name", None), id(value)]
+
+
+class GraphCache:
+    """
+    Thread-safe LRU cache of built agent and supervisor graphs.
+
+    Graphs are keyed by a fingerprint of the configuration they were built
+    from. Concurrent requests for the same missing graph wait for a single
+    build. Named workflows can be registered up front and built together by
+    ``warm_up`` at process start; they are kept outside the LRU.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_GRAPHS):
+        """
+        Args:
+            max_entries: Maximum number of fingerprinted graphs kept.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._building = {}
+        self._builders = {}
+        self._workflows = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, build: Callable[[], Any], **parts) -> Any:
+        """
+        Return the cached graph for a configuration, calling ``build`` on a miss.
+
+        Args:
+            build: Function building the graph from the configuration.
+            **parts: The configuration, e.g. model, tools, prompt, name.
+        """
+        key, refs = _fingerprint(parts)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            future = self._building.get(key)
+            leader = future is None
+            if leader:
+                future = self._building[key] = Future()
+            self.misses += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            graph = build()
+            with self._lock:
+                self._entries[key] = (graph, refs)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            future.set_result(graph)
+            return graph
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
+
+    def register(self, name: str, build: Callable[[], Any]):
+        """
+        Register a named workflow to be built by ``warm_up`` or on first ``workflow`` call.
+
+        Args:
+            name: Name the workflow is looked up by.
+            build: Function returning the built (usually compiled) graph.
+        """
+        with self._lock:
+            self._builders[name] = build
+            self._workflows.pop(name, None)
+
+    def workflow(self, name: str) -> Any:
+        """Return a registered workflow, building it if it has not been built yet."""
+        with self._lock:
+            if name in self._workflows:
+                return self._workflows[name]
+            if name not in self._builders:
+                raise KeyError(f"❌ Error: No workflow registered as '{name}'.")
+            build = self._builders[name]
+        graph = build()
+        with self._lock:
+            return self._workflows.setdefault(name, graph)
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Build registered workflows ahead of the first request.
+
+        Args:
+            names: Workflows to build; all registered ones by default.
+
+        Returns:
+            Dict mapping each name to its built graph.
+        """
+        with self._lock:
+            names = list(self._builders) if names is None else list(names)
+        built = {name: self.workflow(name) for name in names}
+        print(f"✅ Warmed up {len(built)} workflow(s)")
+        return built
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._workflows.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "workflows": len(self._workflows),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_graph_cache() -> GraphCache:
+    """Return the process-wide graph cache."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = GraphCache()
+        return _shared_cache
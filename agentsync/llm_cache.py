@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import warnings
+from typing import Any, Optional
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+import agentsync.config as settings
+
+# Default total size of cached responses before the least recently used are evicted
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Default seconds a cached response is served before it is considered stale
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+# Eviction runs once per this many writes instead of on every write
+EVICT_EVERY = 100
+# Serialized message fields that differ between otherwise identical runs
+VOLATILE_MESSAGE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+# langchain_core.load.loads is marked beta but is what LangChain's own caches use
+warnings.filterwarnings("ignore", message="The function `loads` is in beta")
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Persistent exact-match cache of LLM responses stored in sqlite.
+
+    LangChain calls the cache with the serialized messages as ``prompt`` and
+    the model class, parameters and bound tool schemas as ``llm_string``, so a
+    hit requires the exact same model, settings, conversation and tools. Both
+    are hashed into the key, after dropping message ids and response metadata
+    that LangGraph and the provider assign afresh on every run. Entries older
+    than ``max_age`` are ignored and purged; once the stored responses exceed
+    ``max_bytes`` the least recently used are evicted.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: Optional[float] = DEFAULT_MAX_AGE):
+        """
+        Args:
+            path: Location of the sqlite file; LLM_CACHE_FILE by default.
+            max_bytes: Total size of stored responses kept.
+            max_age: Seconds an entry is served, or None to keep entries until evicted by size.
+        """
+        self.path = path or settings.LLM_CACHE_FILE
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.reset_stats()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, value TEXT, size INTEGER, created_at REAL, used_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_used ON llm_responses (used_at)")
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = _cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.max_age is not None and now - row[1] >= self.max_age):
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE llm_responses SET used_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        try:
+            return loads(row[0])
+        except Exception as e:
+            # Written by an incompatible langchain version; treat as a miss
+            print(f"⚠️ Discarding unreadable LLM cache entry: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        value = dumps(return_val)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, value, size, created_at, used_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (_cache_key(prompt, llm_string), value, len(value), now, now)
+                )
+            self.writes += 1
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= EVICT_EVERY:
+                self._evict()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def evict(self) -> int:
+        """Drop stale entries and trim the cache to ``max_bytes``; returns the number removed."""
+        with self._lock:
+            return self._evict()
+
+    def _evict(self):
+        self._writes_since_evict = 0
+        removed = 0
+        with self._conn:
+            if self.max_age is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.max_age,)
+                ).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk from least to most recently used until enough bytes are freed
+                excess = total - self.max_bytes
+                cutoff = None
+                for used_at, size in self._conn.execute("SELECT used_at, size FROM llm_responses ORDER BY used_at"):
+                    excess -= size
+                    cutoff = used_at
+                    if excess <= 0:
+                        break
+                removed += self._conn.execute("DELETE FROM llm_responses WHERE used_at <= ?", (cutoff,)).rowcount
+        self.evictions += removed
+        return removed
+
+    def reset_stats(self):
+        """Zero the hit/miss counters, e.g. at the start of a run."""
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
+
+
+def with_llm_cache(model: Any, cache: Optional[BaseCache]) -> Any:
+    """
+    Return a copy of a chat model that reads and writes ``cache``.
+
+    The original model is left untouched. Models that are not LangChain
+    language models (e.g. a model name string) are returned unchanged.
+    """
+    if cache is None or model is None:
+        return model
+    if not hasattr(model, "model_copy") or "cache" not in getattr(type(model), "model_fields", {}):
+        print(f"⚠️ Warning: {type(model).__name__} does not support an LLM cache; running uncached.")
+        return model
+    return model.model_copy(update={"cache": cache})
+
+
+def _cache_key(prompt, llm_string):
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(llm_string.encode("utf-8"))
+    digest.update(b"\x1f")
+    digest.update(_normalize_prompt(prompt).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _normalize_prompt(prompt):
+    """Remove per-run message fields from a serialized prompt so re-runs map to the same key."""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    stack = [messages]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            kwargs = item.get("kwargs")
+            if item.get("lc") and isinstance(kwargs, dict):
+                for field in VOLATILE_MESSAGE_FIELDS:
+                    kwargs.pop(field, None)
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return json.dumps(messages, sort_keys=True)
@@ -0,0 +1,154 @@
+import time
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, List, Optional
+from langchain_core.tools import StructuredTool
+from pydantic import BaseModel, Field
+
+# Default number of agents run at the same time by one parallel delegation
+DEFAULT_MAX_PARALLEL_BRANCHES = 4
+# Default seconds a single branch may run before its result is abandoned
+DEFAULT_BRANCH_TIMEOUT = 120.0
+
+PARALLEL_TOOL_NAME = "delegate_parallel"
+
+
+class Branch(BaseModel):
+    agent: str = Field(description="Name of the agent that should handle this subtask")
+    task: str = Field(description="Complete, self-contained instruction for the agent")
+
+
+class ParallelDelegation(BaseModel):
+    branches: List[Branch] = Field(description="Independent subtasks to run at the same time")
+
+
+class ParallelDelegator:
+    """
+    Runs several agents concurrently on independent subtasks and joins their answers.
+
+    Each branch invokes one agent with a fresh conversation holding only its
+    task, so branches cannot see each other. At most ``max_parallel_branches``
+    run at once; a branch still running ``branch_timeout`` seconds after it
+    started is reported as timed out. Async invocations cancel timed-out
+    branches; sync ones cannot stop a running thread, so the branch finishes in
+    the background and its result is discarded.
+    """
+
+    def __init__(self, agents: List[Any], max_parallel_branches: int = DEFAULT_MAX_PARALLEL_BRANCHES,
+                 branch_timeout: Optional[float] = DEFAULT_BRANCH_TIMEOUT):
+        """
+        Args:
+            agents: Agents the branches may be delegated to, looked up by name.
+            max_parallel_branches: Maximum number of branches running at once.
+            branch_timeout: Seconds per branch, or None for no limit.
+        """
+        self.agents = {agent.name: agent for agent in agents}
+        self.max_parallel_branches = max_parallel_branches
+        self.branch_timeout = branch_timeout
+
+    def run(self, branches: List[Branch]) -> str:
+        branches = _as_branches(branches)
+        outcomes = [None] * len(branches)
+        started = {}
+        futures = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_parallel_branches, thread_name_prefix="parallel_branch")
+
+        def invoke(i, agent, task):
+            started[i] = time.monotonic()
+            return agent.invoke(_branch_input(task))
+
+        for i, branch in enumerate(branches):
+            agent = self.agents.get(branch.agent)
+            if agent is None:
+                outcomes[i] = f"❌ Error: Unknown agent '{branch.agent}'"
+            else:
+                futures[executor.submit(invoke, i, agent, branch.task)] = i
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=self._next_timeout(started, pending, futures),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                outcomes[futures[future]] = f"❌ Error: {error}" if error else _final_text(future.result())
+            if self.branch_timeout is None:
+                continue
+            now = time.monotonic()
+            for future in list(pending):
+                i = futures[future]
+                if i in started and now - started[i] >= self.branch_timeout:
+                    outcomes[i] = f"⚠️ Timed out after {self.branch_timeout:g}s"
+                    pending.discard(future)
+        executor.shutdown(wait=False, cancel_futures=True)
+        return _join(branches, outcomes)
+
+    async def arun(self, branches: List[Branch]) -> str:
+        semaphore = asyncio.Semaphore(self.max_parallel_branches)
+
+        async def invoke(branch):
+            agent = self.agents.get(branch.agent)
+            if agent is None:
+                return f"❌ Error: Unknown agent '{branch.agent}'"
+            async with semaphore:
+                try:
+                    result = await asyncio.wait_for(agent.ainvoke(_branch_input(branch.task)), self.branch_timeout)
+                except asyncio.TimeoutError:
+                    return f"⚠️ Timed out after {self.branch_timeout:g}s"
+                except Exception as e:
+                    return f"❌ Error: {e}"
+            return _final_text(result)
+
+        branches = _as_branches(branches)
+        outcomes = await asyncio.gather(*(invoke(branch) for branch in branches))
+        return _join(branches, outcomes)
+
+    def _next_timeout(self, started, pending, futures):
+        """Seconds until the earliest running branch reaches its timeout."""
+        if self.branch_timeout is None:
+            return None
+        running = [started[futures[future]] for future in pending if futures[future] in started]
+        if not running:
+            # Branches are being picked up by the workers; check again shortly
+            return 0.05
+        return max(0.0, min(running) + self.branch_timeout - time.monotonic())
+
+    def as_tool(self) -> StructuredTool:
+        names = ", ".join(self.agents)
+        return StructuredTool.from_function(
+            func=self.run,
+            coroutine=self.arun,
+            name=PARALLEL_TOOL_NAME,
+            description=(
+                "Run several agents at the same time on independent subtasks and return all of "
+                f"their answers together. Available agents: {names}. Use this instead of handing off "
+                "one agent at a time when subtasks do not depend on each other's results."
+            ),
+            args_schema=ParallelDelegation,
+        )
+
+
+def create_parallel_delegation_tool(agents: List[Any], max_parallel_branches: int = DEFAULT_MAX_PARALLEL_BRANCHES,
+                                    branch_timeout: Optional[float] = DEFAULT_BRANCH_TIMEOUT) -> StructuredTool:
+    """Return a supervisor tool fanning independent subtasks out to ``agents`` and joining the results."""
+    return ParallelDelegator(agents, max_parallel_branches, branch_timeout).as_tool()
+
+
+def _as_branches(branches):
+    return [branch if isinstance(branch, Branch) else Branch(**branch) for branch in branches]
+
+
+def _branch_input(task):
+    return {"messages": [{"role": "user", "content": task}]}
+
+
+def _final_text(result):
+    content = result["messages"][-1].content
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content
+
+
+def _join(branches, outcomes):
+    return "\n\n".join(
+        f"## {branch.agent}: {branch.task}\n{outcome}" for branch, outcome in zip(branches, outcomes)
+    )
@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import asyncio
+from typing import Any, AsyncIterator, Callable, Iterable, Optional, Sequence, Tuple, Union
+from agentsync.checkpoint import is_sync_only, thread_config
+
+# Default number of jobs running through the workflow at the same time
+DEFAULT_CONCURRENCY = 8
+# Streamed modes: node updates for the transcript, LLM message chunks for tokens
+DEFAULT_STREAM_MODES = ("updates", "messages")
+
+
+def load_jobs(path: str) -> Iterable[dict]:
+    """Yield jobs from a JSONL file one line at a time, skipping blank lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def job_input(job: Union[str, dict]) -> dict:
+    """
+    Build the workflow input for a job.
+
+    A job is either an instruction string, a dict with ``messages``, or a dict
+    with an ``instruction`` sent as a single user message.
+    """
+    if isinstance(job, str):
+        return {"messages": [{"role": "user", "content": job}]}
+    if "messages" in job:
+        return {"messages": job["messages"]}
+    return {"messages": [{"role": "user", "content": job["instruction"]}]}
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values``, e.g. ``fraction=0.95`` for p95."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class WorkflowRunner:
+    """
+    Runs many jobs through one compiled workflow with bounded concurrency.
+
+    Jobs are read lazily into a bounded queue, so a producer reading a large
+    JSONL file waits whenever the workers fall behind instead of loading every
+    job up front. Each job is executed with ``astream``; intermediate updates
+    and token chunks are passed to ``on_event`` as they arrive, and a result
+    line is appended to the output file as soon as the job finishes.
+    """
+
+    def __init__(self, app: Any, concurrency: int = DEFAULT_CONCURRENCY, queue_size: Optional[int] = None,
+                 stream_modes: Sequence[str] = DEFAULT_STREAM_MODES, job_timeout: Optional[float] = None,
+                 on_event: Optional[Callable[[Any, str, Any], None]] = None,
+                 config_for: Optional[Callable[[Any], Optional[dict]]] = None):
+        """
+        Args:
+            app: Compiled workflow, e.g. ``SupervisorCreator().create_supervisor(..., compile=True)``.
+            concurrency: Number of jobs running at once.
+            queue_size: Jobs buffered ahead of the workers; twice ``concurrency`` by default.
+            stream_modes: LangGraph stream modes passed to ``astream``.
+            job_timeout: Seconds a single job may run, or None for no limit.
+            on_event: Optional callback ``on_event(job_id, mode, chunk)`` for every streamed chunk.
+            config_for: Optional function returning the run config of a job from its id. By
+                default, a workflow compiled with a checkpointer runs each job on the
+                thread ``str(job_id)``, so a re-run with the same ids resumes the jobs.
+        """
+        if is_sync_only(getattr(app, "checkpointer", None)):
+            raise ValueError("❌ Error: WorkflowRunner streams jobs asynchronously, but the workflow was compiled "
+                             "with the sync SqliteSaver. Compile it with async_sqlite_checkpointer() instead.")
+        self.app = app
+        self.concurrency = concurrency
+        self.queue_size = queue_size or 2 * concurrency
+        self.stream_modes = list(stream_modes)
+        self.job_timeout = job_timeout
+        self.on_event = on_event
+        self.config_for = config_for or _default_config_for(app)
+
+    async def astream_job(self, job: Union[str, dict], config: Optional[dict] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yield ``(mode, chunk)`` pairs from the workflow for a single job.
+
+        On a checkpoint thread, an interrupted job resumes from its last
+        completed step and a finished one yields nothing.
+        """
+        input, finished = await self._start(job, config)
+        if finished is not None:
+            return
+        async for mode, chunk in self.app.astream(input, config, stream_mode=self.stream_modes):
+            yield mode, chunk
+
+    async def arun(self, jobs: Union[str, Iterable[Union[str, dict]]], output_path: Optional[str] = None) -> dict:
+        """
+        Run every job and return throughput and latency statistics.
+
+        Args:
+            jobs: Path to a JSONL file of jobs, or an iterable of jobs.
+            output_path: Optional JSONL file receiving one result per finished job.
+
+        Returns:
+            Dict with job counts, elapsed seconds, jobs per second and p50/p95 latency.
+        """
+        if isinstance(jobs, str):
+            jobs = load_jobs(jobs)
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        latencies = []
+        counts = {"ok": 0, "error": 0, "timeout": 0}
+
+        output = None
+        if output_path:
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            output = open(output_path, "a", encoding="utf-8")
+
+        async def produce():
+            for index, job in enumerate(jobs):
+                job_id = job.get("id", index) if isinstance(job, dict) else index
+                await queue.put((job_id, job))
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                result = await self._run_one(*item)
+                counts[result["status"]] += 1
+                latencies.append(result["latency"])
+                if output is not None:
+                    output.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                    output.flush()
+
+        started = time.perf_counter()
+        workers = [asyncio.ensure_future(work()) for _ in range(self.concurrency)]
+        try:
+            await produce()
+            await asyncio.gather(*workers)
+        except BaseException:
+            # Reading the jobs (or a worker) failed: stop every worker before closing the output
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            if output is not None:
+                output.close()
+        elapsed = time.perf_counter() - started
+
+        total = sum(counts.values())
+        summary = {
+            "jobs": total,
+            **counts,
+            "elapsed": round(elapsed, 3),
+            "jobs_per_second": round(total / elapsed, 3) if elapsed else 0.0,
+            "p50_latency": round(percentile(latencies, 0.50), 3),
+            "p95_latency": round(percentile(latencies, 0.95), 3),
+        }
+        print(f"✅ {total} jobs in {summary['elapsed']}s ({summary['jobs_per_second']} jobs/s), "
+              f"p50 {summary['p50_latency']}s, p95 {summary['p95_latency']}s, "
+              f"{counts['error']} errors, {counts['timeout']} timeouts")
+        return summary
+
+    def run(self, jobs: Union[str, Iterable[Union[str, dict]]], output_path: Optional[str] = None) -> dict:
+        """Synchronous wrapper around ``arun``."""
+        return asyncio.run(self.arun(jobs, output_path))
+
+    async def _run_one(self, job_id, job):
+        started = time.perf_counter()
+        result = {"id": job_id}
+        try:
+            messages = await asyncio.wait_for(self._consume(job_id, job), self.job_timeout)
+            result.update(status="ok", output=_message_text(messages[-1]) if messages else "")
+        except asyncio.TimeoutError:
+            result.update(status="timeout", error=f"Timed out after {self.job_timeout:g}s")
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            result.update(status="error", error=str(e))
+        result["latency"] = round(time.perf_counter() - started, 3)
+        return result
+
+    async def _consume(self, job_id, job):
+        """Drain the job's stream, forwarding chunks and returning the last update's messages."""
+        config = self.config_for(job_id)
+        input, finished = await self._start(job, config)
+        if finished is not None:
+            print(f"✅ Job {job_id} already completed")
+            return finished.get("messages", [])
+        messages = []
+        async for mode, chunk in self.app.astream(input, config, stream_mode=self.stream_modes):
+            if self.on_event is not None:
+                self.on_event(job_id, mode, chunk)
+            if mode == "updates":
+                for update in chunk.values():
+                    if isinstance(update, dict) and update.get("messages"):
+                        messages = update["messages"]
+        return messages
+
+
+    async def _start(self, job, config):
+        """
+        Return the input to stream for a job and, if its thread already finished, its final state.
+
+        A thread with pending steps is resumed by streaming None, as in ``run_or_resume``.
+        """
+        thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+        if thread_id is None or getattr(self.app, "checkpointer", None) is None:
+            return job_input(job), None
+        state = await self.app.aget_state(config)
+        if state.next:
+            print(f"⚠️ Resuming thread {thread_id} at {', '.join(state.next)}")
+            return None, None
+        if state.values:
+            return None, state.values
+        return job_input(job), None
+
+
+def _default_config_for(app):
+    if getattr(app, "checkpointer", None) is None:
+        return lambda job_id: None
+    return lambda job_id: thread_config(str(job_id))
+
+
+def _message_text(message):
+    content = message.content if hasattr(message, "content") else message.get("content", "")
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return content
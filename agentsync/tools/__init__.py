@@ -0,0 +1,40 @@
+"""
+Tools shipped with agentsync.
+
+Tool classes are exported lazily: ``from agentsync.tools import GmailTool``
+imports only the Gmail module, not the search, Sheets or verification
+dependencies of the other tools.
+"""
+import importlib
+
+# Public name -> module of this package that defines it
+_EXPORTS = {
+    "GmailTool": "gmail_tool",
+    "GoogleCalendarTool": "google_calender_tool",
+    "get_calendar_tools": "google_calender_tool",
+    "GoogleSheetsTool": "google_sheets_tool",
+    "HunterIoEmailVerifierTool": "email_verifier_tool",
+    "GoogleSearchTool": "web_search_tool",
+    "DuckDuckGoSearchTool": "web_search_tool",
+    "MultiSearchTool": "web_search_tool",
+    "VisitWebpageTool": "web_search_tool",
+    "VisitWebpagesTool": "web_search_tool",
+    "LazyTool": "lazy",
+    "CachePolicy": "memoize",
+    "ToolCache": "memoize",
+    "cacheable": "memoize",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,146 @@
+import os
+import json
+import bisect
+import datetime
+import threading
+
+
+def parse_event_time(value):
+    """
+    Convert a Calendar start/end object to epoch seconds.
+
+    Timed events use ``dateTime`` (naive values are taken as UTC); all-day
+    events use ``date`` and start at midnight UTC.
+    """
+    if "dateTime" in value:
+        moment = datetime.datetime.fromisoformat(value["dateTime"])
+    else:
+        moment = datetime.datetime.fromisoformat(value["date"])
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.timestamp()
+
+
+def format_timestamp(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat()
+
+
+class CalendarStore:
+    """
+    Local copy of a calendar kept current through syncToken incremental sync.
+
+    Events are indexed as a list of (start, end, event_id) tuples sorted by
+    start. Together with the longest event duration seen, this bounds every
+    overlap query to a bisected slice of the index. Only events up to
+    ``window_end`` are held, since recurring events are expanded into
+    instances. Callers syncing the store hold ``lock`` for the whole sync.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sync_token = None
+        self.last_synced = 0.0
+        # Epoch seconds up to which the last full sync listed events
+        self.window_end = None
+        self.events = {}
+        self._index = []
+        self._max_duration = 0.0
+        self.lock = threading.RLock()
+
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            self.sync_token = data.get("sync_token")
+            self.last_synced = data.get("last_synced", 0.0)
+            self.window_end = data.get("window_end")
+            for event in data.get("events", []):
+                self.upsert(event)
+
+    def apply(self, items):
+        """Apply a page of events().list results, removing cancelled events."""
+        with self.lock:
+            for event in items:
+                if event.get("status") == "cancelled":
+                    self.remove(event["id"])
+                else:
+                    self.upsert(event)
+
+    def upsert(self, event):
+        with self.lock:
+            self.remove(event["id"])
+            if "start" not in event or "end" not in event:
+                return
+            start = parse_event_time(event["start"])
+            end = parse_event_time(event["end"])
+            self.events[event["id"]] = event
+            bisect.insort(self._index, (start, end, event["id"]))
+            self._max_duration = max(self._max_duration, end - start)
+
+    def remove(self, event_id):
+        with self.lock:
+            event = self.events.pop(event_id, None)
+            if event is None:
+                return
+            entry = (parse_event_time(event["start"]), parse_event_time(event["end"]), event_id)
+            position = bisect.bisect_left(self._index, entry)
+            if position < len(self._index) and self._index[position] == entry:
+                del self._index[position]
+
+    def clear(self):
+        with self.lock:
+            self.sync_token = None
+            self.window_end = None
+            self.events = {}
+            self._index = []
+            self._max_duration = 0.0
+
+    def overlapping(self, start, end, busy_only=False):
+        """
+        Return events overlapping [start, end), ordered by start time.
+
+        Args:
+            start: Window start in epoch seconds.
+            end: Window end in epoch seconds.
+            busy_only: Skip events marked as free (transparent).
+        """
+        with self.lock:
+            low = bisect.bisect_left(self._index, (start - self._max_duration,))
+            high = bisect.bisect_left(self._index, (end,))
+            events = [self.events[event_id] for _, event_end, event_id in self._index[low:high] if event_end > start]
+        if busy_only:
+            events = [event for event in events if event.get("transparency") != "transparent"]
+        return events
+
+    def upcoming(self, now, limit):
+        """Return up to ``limit`` events that have not ended yet, ordered by start time."""
+        with self.lock:
+            low = bisect.bisect_left(self._index, (now - self._max_duration,))
+            events = []
+            for _, event_end, event_id in self._index[low:]:
+                if event_end > now:
+                    events.append(self.events[event_id])
+                    if len(events) == limit:
+                        break
+            return events
+
+    def busy_intervals(self, start, end):
+        """Return merged (start, end) busy intervals clipped to [start, end)."""
+        merged = []
+        for event in self.overlapping(start, end, busy_only=True):
+            event_start = max(parse_event_time(event["start"]), start)
+            event_end = min(parse_event_time(event["end"]), end)
+            if merged and event_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], event_end)
+            else:
+                merged.append([event_start, event_end])
+        return [tuple(interval) for interval in merged]
+
+    def save(self):
+        with self.lock:
+            data = {"sync_token": self.sync_token, "last_synced": self.last_synced, "window_end": self.window_end,
+                    "events": list(self.events.values())}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
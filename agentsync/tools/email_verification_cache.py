@@ -0,0 +1,158 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+
+# Seconds a cached verification stays fresh, per outcome class
+DEFAULT_TTLS = {
+    "valid": 30 * 24 * 3600,
+    "invalid": 90 * 24 * 3600,
+    "unknown": 24 * 3600,
+}
+# Seconds a domain stays on the negative cache (no MX records, disposable provider)
+DOMAIN_NEGATIVE_TTL = 7 * 24 * 3600
+
+EMAIL_PATTERN = re.compile(
+    r"^[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}$"
+)
+
+# Common throwaway mailbox providers rejected without calling the API
+DISPOSABLE_DOMAINS = frozenset({
+    "10minutemail.com", "dispostable.com", "emailondeck.com", "fakeinbox.com",
+    "getnada.com", "guerrillamail.com", "guerrillamail.net", "maildrop.cc",
+    "mailinator.com", "mailnesia.com", "mintemail.com", "mohmal.com",
+    "sharklasers.com", "spamgourmet.com", "temp-mail.org", "tempmail.com",
+    "tempmailo.com", "throwawaymail.com", "trashmail.com", "yopmail.com",
+})
+
+
+def normalize_email(email):
+    """Normalize an address for cache lookups."""
+    return email.strip().lower()
+
+
+def precheck_email(email):
+    """
+    Reject addresses that can be ruled out without a network call.
+
+    Args:
+        email: A normalized email address.
+
+    Returns:
+        The rejection reason ("syntax" or "disposable"), or None if the address
+        should be verified remotely.
+    """
+    if len(email) > 254 or not EMAIL_PATTERN.match(email) or len(email.split("@")[0]) > 64:
+        return "syntax"
+    if email.split("@")[1] in DISPOSABLE_DOMAINS:
+        return "disposable"
+    return None
+
+
+def dedupe_emails(emails):
+    """Normalize addresses and collapse duplicates, keeping first-seen order."""
+    seen = {}
+    for email in emails:
+        if email:
+            seen.setdefault(normalize_email(email), None)
+    return list(seen)
+
+
+def _ttl_class(status):
+    if status == "valid":
+        return "valid"
+    if status in ("invalid", "disposable"):
+        return "invalid"
+    return "unknown"
+
+
+class VerificationCache:
+    """
+    Sqlite-backed cache of email verification results.
+
+    Results are keyed on the normalized address and expire after a TTL that
+    depends on the outcome, so valid and invalid addresses are kept much longer
+    than inconclusive ones. A separate domain table remembers domains that can
+    never receive mail, letting every address on them be rejected locally.
+    """
+
+    def __init__(self, path, ttls=None, domain_ttl=DOMAIN_NEGATIVE_TTL):
+        """
+        Args:
+            path: Location of the sqlite database file.
+            ttls: Optional overrides of DEFAULT_TTLS.
+            domain_ttl: Seconds a domain stays on the negative cache.
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.domain_ttl = domain_ttl
+        self.hits = 0
+        self.misses = 0
+        self.domain_hits = 0
+        self.prechecked = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS emails (email TEXT PRIMARY KEY, status TEXT, checked_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS domains (domain TEXT PRIMARY KEY, reason TEXT, checked_at REAL)"
+            )
+
+    def get(self, email):
+        """Return the cached status of a normalized address, or None if missing or stale."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, checked_at FROM emails WHERE email = ?", (email,)
+            ).fetchone()
+            if row and time.time() - row[1] < self.ttls[_ttl_class(row[0])]:
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, email, status):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO emails (email, status, checked_at) VALUES (?, ?, ?)",
+                (email, status, time.time())
+            )
+
+    def get_domain(self, domain):
+        """Return the reason a domain is on the negative cache, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reason, checked_at FROM domains WHERE domain = ?", (domain,)
+            ).fetchone()
+            if row and time.time() - row[1] < self.domain_ttl:
+                self.domain_hits += 1
+                return row[0]
+            return None
+
+    def put_domain(self, domain, reason):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO domains (domain, reason, checked_at) VALUES (?, ?, ?)",
+                (domain, reason, time.time())
+            )
+
+    def record_precheck(self):
+        with self._lock:
+            self.prechecked += 1
+
+    def stats(self):
+        """Return hit/miss counters and the share of lookups served without the API."""
+        with self._lock:
+            local = self.hits + self.domain_hits + self.prechecked
+            lookups = local + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "domain_hits": self.domain_hits,
+                "prechecked": self.prechecked,
+                "hit_rate": round(local / lookups, 3) if lookups else 0.0,
+            }
@@ -1,27 +1,201 @@
+import asyncio
 import requests
 import agentsync.config as settings
+from agentsync.tools.email_verification_cache import (
+    VerificationCache,
+    dedupe_emails,
+    normalize_email,
+    precheck_email,
+)
+from agentsync.tools.rate_limiter import AsyncTokenBucket, backoff_delay
+
+# Hunter's Email Verifier API allows 10 requests per second
+HUNTER_VERIFY_RATE = 10
+# Seconds before a single verification request is abandoned
+REQUEST_TIMEOUT = 15
+# Hunter answers 202 while a verification is still running and 429 when rate limited
+RETRY_STATUSES = (202, 429, 500, 502, 503, 504)
 
 class HunterIoEmailVerifierTool:
-    def __init__(self):
-        """Initialize with Hunter.io API key"""
+    def __init__(self, use_cache=True, cache_path=None):
+        """
+        Initialize with Hunter.io API key
+
+        Args:
+            use_cache: Whether to cache verification results on disk.
+            cache_path: Location of the sqlite cache, defaults to EMAIL_VERIFICATION_CACHE_FILE.
+        """
         self.api_key = settings.HUNTER_API_KEY
         self.base_url = "https://api.hunter.io/v2/email-verifier"
+        self.session = requests.Session()
+        self.cache = None
+        if use_cache:
+            self.cache = VerificationCache(cache_path or settings.EMAIL_VERIFICATION_CACHE_FILE)
 
     def verify_email(self, email):
         """Check email validity using Hunter.io API"""
         if not email:
             return False
+        email = normalize_email(email)
+
+        status = self._check_locally(email)
+        if status is not None:
+            return status == "valid"
+
         params = {
             "email": email,
             "api_key": self.api_key
         }
-        response = requests.get(self.base_url, params=params)
-        data = response.json()
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=REQUEST_TIMEOUT)
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            print(f" Email verification failed: {e}")
+            return False
 
         # Check if the API request was successful
         if response.status_code == 200 and "data" in data:
+            self._record(email, data["data"])
             status = data["data"]["status"]
             return status == "valid"  # Return True if valid, False otherwise
         else:
             print(f" Email verification failed: {data.get('errors', 'Unknown error')}")
             return False
+
+    def verify_many(self, emails, concurrency=10, rate_per_second=HUNTER_VERIFY_RATE,
+                    timeout=REQUEST_TIMEOUT, max_retries=3, progress=None):
+        """
+        Verify a list of addresses concurrently.
+
+        Blocking wrapper around ``averify_many``; use that coroutine directly
+        when an event loop is already running.
+
+        Returns:
+            List of booleans in the same order as ``emails``.
+        """
+        return asyncio.run(self.averify_many(
+            emails, concurrency=concurrency, rate_per_second=rate_per_second,
+            timeout=timeout, max_retries=max_retries, progress=progress
+        ))
+
+    async def averify_many(self, emails, concurrency=10, rate_per_second=HUNTER_VERIFY_RATE,
+                           timeout=REQUEST_TIMEOUT, max_retries=3, progress=None):
+        """
+        Verify a list of addresses on asyncio with one pooled HTTP session.
+
+        Duplicates are collapsed and addresses resolvable from the pre-checks or
+        the cache never reach the network. The rest are verified with at most
+        ``concurrency`` requests in flight, under a token bucket matching
+        Hunter's requests-per-second limit, with a per-request timeout and
+        backoff on 429 and transient errors.
+
+        Args:
+            emails: Addresses to verify; duplicates and empty values are allowed.
+            concurrency: Maximum number of requests in flight.
+            rate_per_second: Maximum requests started per second.
+            timeout: Seconds before a single request is abandoned.
+            max_retries: Retries per address after a 429, 202 or transient error.
+            progress: Optional callback ``progress(done, total, email, valid)``
+                invoked as each remote verification completes.
+
+        Returns:
+            List of booleans in the same order as ``emails``.
+        """
+        # aiohttp takes a quarter of a second to import; only bulk runs need it
+        import aiohttp
+
+        statuses = {}
+        pending = []
+        for email in dedupe_emails(emails):
+            status = self._check_locally(email)
+            if status is None:
+                pending.append(email)
+            else:
+                statuses[email] = status
+
+        total = len(pending)
+        done = 0
+        limiter = AsyncTokenBucket(rate_per_second)
+        semaphore = asyncio.Semaphore(concurrency)
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            async def verify(email):
+                nonlocal done
+                async with semaphore:
+                    statuses[email] = await self._averify(session, limiter, email, max_retries)
+                done += 1
+                if progress:
+                    progress(done, total, email, statuses[email] == "valid")
+
+            await asyncio.gather(*(verify(email) for email in pending))
+
+        return [bool(email) and statuses.get(normalize_email(email)) == "valid" for email in emails]
+
+    async def _averify(self, session, limiter, email, max_retries):
+        """Verify one address, returning its Hunter status or None on failure."""
+        import aiohttp
+
+        params = {
+            "email": email,
+            "api_key": self.api_key
+        }
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            try:
+                async with session.get(self.base_url, params=params) as response:
+                    if response.status in RETRY_STATUSES and attempt < max_retries:
+                        retry_after = response.headers.get("Retry-After", "")
+                        delay = float(retry_after) if retry_after.isdigit() else backoff_delay(attempt)
+                        await asyncio.sleep(delay)
+                        attempt += 1
+                        continue
+                    data = await response.json(content_type=None)
+                    status_code = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                if attempt < max_retries:
+                    await asyncio.sleep(backoff_delay(attempt))
+                    attempt += 1
+                    continue
+                print(f" Email verification failed for {email}: {e!r}")
+                return None
+
+            if status_code == 200 and "data" in data:
+                self._record(email, data["data"])
+                return data["data"]["status"]
+            print(f" Email verification failed for {email}: {data.get('errors', 'Unknown error')}")
+            return None
+
+    def cache_stats(self):
+        """Return cache hit/miss counters, or an empty dict when caching is disabled."""
+        return self.cache.stats() if self.cache else {}
+
+    def _check_locally(self, email):
+        """
+        Resolve a normalized address without the API when possible.
+
+        Returns:
+            The known status, or None if the address must be verified remotely.
+        """
+        if precheck_email(email) is not None:
+            if self.cache:
+                self.cache.record_precheck()
+            return "invalid"
+        if self.cache is None:
+            return None
+        if self.cache.get_domain(email.split("@")[1]) is not None:
+            return "invalid"
+        return self.cache.get(email)
+
+    def _record(self, email, result):
+        """Store a Hunter result, adding its domain to the negative cache when it cannot receive mail."""
+        if self.cache is None:
+            return
+        self.cache.put(email, result.get("status", "unknown"))
+        domain = email.split("@")[1]
+        if result.get("mx_records") is False:
+            self.cache.put_domain(domain, "no_mx")
+        elif result.get("disposable") is True:
+            self.cache.put_domain(domain, "disposable")
@@ -1,53 +1,89 @@
 import os
+import json
+import time
+import html
 import base64
-import google.auth
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import agentsync.config as settings
 from googleapiclient.errors import HttpError
+from agentsync.tools.google_client import execute_batch, get_registry, is_retryable
+from agentsync.tools.idempotency import get_idempotency_store
+from agentsync.tools.rate_limiter import TokenBucket, backoff_delay
+
+# Gmail accepts up to 100 calls per batch but recommends 50 to avoid rate limiting
+GMAIL_BATCH_SIZE = 50
+# Maximum number of message ids accepted by a single batchModify call
+GMAIL_MODIFY_LIMIT = 1000
+# Maximum number of message ids returned by a single messages().list call
+GMAIL_LIST_LIMIT = 500
+# messages.send costs 100 of the 250 quota units available per user per second
+GMAIL_SEND_RATE = 2.5
+
+
+def _parts_mask(depth):
+    """Field mask selecting MIME type and inline data of nested parts down to ``depth`` levels."""
+    if depth == 0:
+        return "mimeType,body/data"
+    return f"mimeType,body/data,parts({_parts_mask(depth - 1)})"
+
+
+# Field masks cannot recurse, so nested parts are spelled out explicitly;
+# five levels covers mixed > alternative > related layouts with room to spare.
+MIME_MASK_DEPTH = 5
+
+# messages().get parameters per read mode:
+#   full     - the whole message resource (legacy behaviour)
+#   body     - headers, snippet and the MIME type and inline data of every part, nothing else;
+#              parses to the same sender/body as "full" for messages nested up to MIME_MASK_DEPTH
+#   metadata - only the From header and Gmail's plain-text snippet
+GMAIL_READ_MODES = {
+    "full": {"format": "full"},
+    "body": {"format": "full", "fields": f"id,threadId,snippet,payload(headers,{_parts_mask(MIME_MASK_DEPTH)})"},
+    "metadata": {"format": "metadata", "metadataHeaders": ["From"], "fields": "id,threadId,snippet,payload/headers"},
+}
+
+GMAIL_SCOPES = [
+    "https://www.googleapis.com/auth/gmail.send",
+    "https://www.googleapis.com/auth/gmail.readonly",
+    "https://www.googleapis.com/auth/gmail.modify",
+]
 
 class GmailTool:
-    def __init__(self):
-        """Authenticate using OAuth 2.0 to access Gmail API"""
-        SCOPES = [
-            "https://www.googleapis.com/auth/gmail.send",
-            "https://www.googleapis.com/auth/gmail.readonly",
-            "https://www.googleapis.com/auth/gmail.modify",
-        ]
-        creds = None
-        client_secret_file = settings.CLIENT_SECRET_FILE
-
-        # Check if token file exists
-        if os.path.exists(client_secret_file):
-            try:
-                creds = Credentials.from_authorized_user_file(client_secret_file, SCOPES)
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(google.auth.transport.requests.Request())  # Refresh expired token
-            except Exception as e:
-                print(f"⚠️ Error loading token.json: {e}")
-                creds = None  # Force re-authentication
+    def __init__(self, read_mode="body"):
+        """
+        Authenticate using OAuth 2.0 to access Gmail API
+
+        Args:
+            read_mode: How much of each message to download, one of GMAIL_READ_MODES. The
+                default "body" yields the same sender and body as "full" (the unmasked
+                payload of earlier versions) while downloading far less.
+        """
+        if read_mode not in GMAIL_READ_MODES:
+            raise ValueError(f"❌ Error: Unknown read mode '{read_mode}'. Use one of {list(GMAIL_READ_MODES)}.")
+        self.read_mode = read_mode
+        self.creds = get_registry().user_credentials(settings.CLIENT_SECRET_FILE, GMAIL_SCOPES)
 
-        # If credentials are not available, authenticate
-        if not creds or not creds.valid:
-            flow = InstalledAppFlow.from_client_secrets_file(client_secret_file, SCOPES)
-            creds = flow.run_local_server(port=0)
-            # Save new token
-            with open(client_secret_file, "w") as token:
-                token.write(creds.to_json())
-        self.service = build("gmail", "v1", credentials=creds)
+    @property
+    def service(self):
+        """Gmail service shared with every tool running on the calling thread."""
+        return get_registry().service("gmail", "v1", self.creds)
 
+    def send_email(self, recipient, subject, message, idempotency_key=None):
 
-    def send_email(self, recipient, subject, message):
+        """Sends an email using Gmail API with correct formatting
 
-        """Sends an email using Gmail API with correct formatting"""
+        With an ``idempotency_key``, an email already sent under the same key
+        (e.g. before a crash and resume) is not sent again.
+        """
         if not recipient:
             raise ValueError("❌ Error: Recipient email address is required.")
+        if idempotency_key is not None:
+            return get_idempotency_store().run(
+                idempotency_key, lambda: self.send_email(recipient, subject, message)
+            )
 
-        # Construct raw email format
-        email_msg = f"To: {recipient}\nSubject: {subject}\n\n{message}"
-        encoded_msg = base64.urlsafe_b64encode(email_msg.encode("utf-8")).decode("utf-8")
-        message_body = {"raw": encoded_msg}
+        message_body = _build_message(recipient, subject, message)
 
         try:
             self.service.users().messages().send(userId="me", body=message_body).execute()
@@ -57,65 +93,348 @@ class GmailTool:
             print(f"❌ Error sending email: {e}")
             return False
 
+    def send_bulk(self, items, max_workers=8, rate_per_second=GMAIL_SEND_RATE, max_retries=5):
+        """
+        Send many emails through a bounded worker pool under Gmail's send quota.
+
+        Every send first takes a token from a token bucket sized to the per-user
+        quota; 429 and 403 rateLimitExceeded responses are retried with
+        exponential backoff. A 5xx response is not retried, since Gmail may have
+        sent the message already; it is reported with ``delivery_unknown`` set.
+        Items are read lazily, with at most twice ``max_workers`` sends queued.
+
+        Args:
+            items: Iterable of (recipient, subject, message) tuples.
+            max_workers: Maximum number of concurrent sends.
+            rate_per_second: Sustained sends per second allowed by the limiter.
+            max_retries: Retries per message after a rate-limit error.
+
+        Returns:
+            Dict with per-recipient ``results`` in input order and throughput stats.
+        """
+        limiter = TokenBucket(rate_per_second)
+        started = time.monotonic()
+
+        results = []
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for item in items:
+                if len(pending) >= 2 * max_workers:
+                    results.append(pending.popleft().result())
+                pending.append(executor.submit(self._send_with_retry, *item, limiter=limiter, max_retries=max_retries))
+            results.extend(future.result() for future in pending)
+
+        elapsed = time.monotonic() - started
+        sent = sum(1 for result in results if result["success"])
+        print(f"✅ Bulk send finished: {sent}/{len(results)} emails sent in {elapsed:.1f}s")
+        return {
+            "results": results,
+            "sent": sent,
+            "failed": len(results) - sent,
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_per_second": round(sent / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+
+    def _send_with_retry(self, recipient, subject, message, limiter, max_retries):
+        """Send one message from a worker thread, retrying when rate limited."""
+        if not recipient:
+            return {"recipient": recipient, "success": False, "attempts": 0,
+                    "error": "Recipient email address is required."}
+
+        message_body = _build_message(recipient, subject, message)
+        attempt = 0
+        while True:
+            limiter.acquire()
+            try:
+                response = self.service.users().messages().send(
+                    userId="me", body=message_body
+                ).execute()
+                return {"recipient": recipient, "success": True, "attempts": attempt + 1,
+                        "message_id": response.get("id")}
+            except HttpError as e:
+                if attempt < max_retries and is_retryable(e, transient=False):
+                    time.sleep(backoff_delay(attempt))
+                    attempt += 1
+                    continue
+                result = {"recipient": recipient, "success": False, "attempts": attempt + 1, "error": str(e)}
+                if e.resp.status >= 500:
+                    # The server may have accepted the message before failing
+                    result["delivery_unknown"] = True
+                return result
+            except Exception as e:
+                return {"recipient": recipient, "success": False, "attempts": attempt + 1, "error": str(e)}
+
     def fetch_email_responses(self):
         """
         Fetch unread email responses and return only the sender email and message content.
-        Returns a dictionary: { sender_email: message_text }
+        Returns a dictionary: { sender_email: [message_text, ...] }
         """
         response_data = {}
+        for message in self.iter_email_responses():
+            response_data.setdefault(message["sender"], []).append(message["body"])
+        return response_data
+
+    def iter_email_responses(self, query="is:unread", label_ids=("INBOX",), page_size=100, mark_read=True):
+        """
+        Stream unread email responses page by page.
 
+        Lists every matching message id first, following ``nextPageToken``, then
+        fetches the messages a page at a time through Gmail batch HTTP requests
+        and marks each page as read with a single ``batchModify`` call. Marking
+        messages read while still listing would shift the unread listing under
+        its page token, so nothing is yielded until the listing is complete and
+        every matching id (but only one page of messages) is held in memory.
+
+        Args:
+            query: Gmail search query used to select messages.
+            label_ids: Labels the messages must carry.
+            page_size: Number of messages fetched and marked as read per page.
+            mark_read: Whether to remove the UNREAD label from fetched messages.
+
+        Yields:
+            Dict with ``id``, ``thread_id``, ``sender`` and ``body`` for each message.
+        """
         try:
-            # Fetch unread emails
+            yield from self._iter_query(query, label_ids, page_size, mark_read)
+        except HttpError as error:
+            print(f"❌ Gmail API error: {error}")
+        except Exception as e:
+            print(f"❌ Error fetching email responses: {e}")
+
+    def sync_email_responses(self, state_file=None, mark_read=True):
+        """
+        Incrementally fetch unread inbox messages added since the last sync.
+
+        The last seen ``historyId`` is persisted in a small JSON state file and
+        ``users().history().list`` is used to list only messages added since then,
+        so each poll costs O(new mail) rather than O(inbox). Without a cursor, or
+        when Gmail reports it as expired, a full ``is:unread`` resync is run. The
+        cursor is only advanced once all messages of the poll have been consumed;
+        messages that could not be fetched are saved with it and retried on the
+        next poll.
+
+        Args:
+            state_file: Path of the JSON file holding the sync cursor.
+            mark_read: Whether to remove the UNREAD label from fetched messages.
+
+        Yields:
+            Dict with ``id``, ``thread_id``, ``sender`` and ``body`` for each message.
+        """
+        state_file = state_file or settings.GMAIL_SYNC_STATE_FILE
+        state = _load_sync_state(state_file)
+        history_id = state.get("history_id")
+        retry_ids = state.get("failed_ids", [])
+        failed_ids = []
+
+        try:
+            msg_ids = None
+            if history_id:
+                try:
+                    msg_ids, latest_history_id = self._list_history(history_id)
+                except HttpError as error:
+                    if error.resp.status != 404:
+                        raise
+                    print("⚠️ Gmail history cursor expired, running a full resync")
+
+            if msg_ids is None:
+                # Take the cursor first so mail arriving during the resync is not skipped
+                profile = self.service.users().getProfile(userId="me").execute()
+                latest_history_id = profile["historyId"]
+                if retry_ids:
+                    yield from self._iter_messages(retry_ids, mark_read=mark_read, failed=failed_ids)
+                yield from self._iter_query("is:unread", ("INBOX",), 100, mark_read, failed=failed_ids,
+                                            skip=set(retry_ids))
+            else:
+                retrying = set(retry_ids)
+                msg_ids = retry_ids + [msg_id for msg_id in msg_ids if msg_id not in retrying]
+                yield from self._iter_messages(msg_ids, mark_read=mark_read, failed=failed_ids)
+
+            _save_sync_state(state_file, {"history_id": latest_history_id, "failed_ids": failed_ids})
+
+        except HttpError as error:
+            print(f"❌ Gmail API error: {error}")
+        except Exception as e:
+            print(f"❌ Error syncing email responses: {e}")
+
+    def _iter_query(self, query, label_ids, page_size, mark_read, failed=None, skip=()):
+        """
+        List every message of a search, then fetch and yield them ``page_size`` at a time.
+
+        Memory grows with the number of matching ids; messages not in ``skip`` are yielded.
+        """
+        # Marking messages read removes them from an "is:unread" listing, which would shift
+        # later pages under the page token; finish the listing before modifying anything
+        msg_ids = []
+        page_token = None
+        while True:
             results = self.service.users().messages().list(
                 userId="me",
-                labelIds=["INBOX"],
-                q="is:unread"
+                labelIds=list(label_ids),
+                q=query,
+                maxResults=GMAIL_LIST_LIMIT,
+                pageToken=page_token
             ).execute()
 
-            messages = results.get("messages", [])
-            for msg in messages:
-                msg_id = msg["id"]
-                message = self.service.users().messages().get(userId="me", id=msg_id, format="full").execute()
-
-                payload = message.get("payload", {})
-                headers = payload.get("headers", [])
-                email_body = ""
-
-                # Extract sender email
-                sender_email = ""
-                for header in headers:
-                    if header["name"] == "From":
-                        sender_email = header["value"]
-                        sender_email = sender_email.split("<")[-1].replace(">", "").strip()  # Clean email format
-                        break
-
-                # Extract message content
-                if "parts" in payload:
-                    for part in payload.get("parts", []):
-                        if part.get("mimeType") == "text/plain":
-                            body_data = part.get("body", {}).get("data", "")
-                            if body_data:
-                                email_body = base64.urlsafe_b64decode(body_data).decode("utf-8").strip()
-                                break
+            msg_ids.extend(msg["id"] for msg in results.get("messages", []) if msg["id"] not in skip)
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                break
+
+        for start in range(0, len(msg_ids), page_size):
+            yield from self._iter_messages(msg_ids[start:start + page_size], mark_read=mark_read, failed=failed)
+
+    def _list_history(self, start_history_id):
+        """
+        List unread inbox messages added after the given history id.
+
+        Returns:
+            Tuple of (message ids in arrival order, latest mailbox history id).
+        """
+        msg_ids = []
+        seen = set()
+        page_token = None
+        while True:
+            results = self.service.users().history().list(
+                userId="me",
+                startHistoryId=start_history_id,
+                historyTypes=["messageAdded"],
+                labelId="INBOX",
+                pageToken=page_token
+            ).execute()
+
+            for record in results.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    message = added.get("message", {})
+                    if "UNREAD" in message.get("labelIds", []) and message["id"] not in seen:
+                        seen.add(message["id"])
+                        msg_ids.append(message["id"])
+
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return msg_ids, results.get("historyId", start_history_id)
+
+    def _iter_messages(self, msg_ids, mark_read=True, failed=None):
+        """Fetch, parse and optionally mark as read the given message ids."""
+        fetched_ids = []
+        for message in self._batch_get_messages(msg_ids, failed):
+            fetched_ids.append(message["id"])
+            parsed = _parse_message(message)
+            # Only yield messages carrying both a sender and a body
+            if parsed["sender"] and parsed["body"]:
+                yield parsed
+
+        if mark_read and fetched_ids:
+            self._mark_read(fetched_ids)
+
+    def _batch_get_messages(self, msg_ids, failed=None):
+        """
+        Fetch messages in Gmail batch requests, yielding each batch as it completes.
+
+        Ids that could not be fetched are appended to ``failed``, except deleted messages.
+        """
+        for start in range(0, len(msg_ids), GMAIL_BATCH_SIZE):
+            chunk = msg_ids[start:start + GMAIL_BATCH_SIZE]
+            requests = [
+                self.service.users().messages().get(userId="me", id=msg_id, **GMAIL_READ_MODES[self.read_mode])
+                for msg_id in chunk
+            ]
+            # Results come back in listing order; rate-limited reads are resent with backoff
+            for msg_id, (response, error) in zip(chunk, execute_batch(self.service, requests, GMAIL_BATCH_SIZE)):
+                if error is not None:
+                    # Left unread; sync_email_responses retries it on the next poll
+                    print(f"❌ Error fetching message {msg_id}: {error}")
+                    gone = isinstance(error, HttpError) and error.resp.status == 404
+                    if failed is not None and not gone:
+                        failed.append(msg_id)
                 else:
-                    body_data = payload.get("body", {}).get("data", "")
-                    if body_data:
-                        email_body = base64.urlsafe_b64decode(body_data).decode("utf-8").strip()
-
-                # Store response (only email and message)
-                if sender_email and email_body:
-                    response_data[sender_email] = email_body
-
-                # Mark email as read
-                self.service.users().messages().modify(
-                    userId="me",
-                    id=msg_id,
-                    body={"removeLabelIds": ["UNREAD"]}
-                ).execute()
+                    yield response
 
-        except HttpError as error:
-            print(f"❌ Gmail API error: {error}")
-        except Exception as e:
-            print(f"❌ Error fetching email responses: {e}")
+    def _mark_read(self, msg_ids):
+        """Remove the UNREAD label from the given messages in a single request."""
+        for start in range(0, len(msg_ids), GMAIL_MODIFY_LIMIT):
+            self.service.users().messages().batchModify(
+                userId="me",
+                body={"ids": msg_ids[start:start + GMAIL_MODIFY_LIMIT], "removeLabelIds": ["UNREAD"]}
+            ).execute()
+
+
+def _build_message(recipient, subject, message):
+    """Construct the raw, base64url-encoded message body expected by messages().send."""
+    email_msg = f"To: {recipient}\nSubject: {subject}\n\n{message}"
+    encoded_msg = base64.urlsafe_b64encode(email_msg.encode("utf-8")).decode("utf-8")
+    return {"raw": encoded_msg}
+
+
+def _load_sync_state(state_file):
+    """Load the persisted sync state, returning an empty state if missing or unreadable."""
+    if not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Error loading Gmail sync state: {e}")
+        return {}
+
+
+def _save_sync_state(state_file, state):
+    """Atomically persist the sync state next to its final location."""
+    os.makedirs(os.path.dirname(os.path.abspath(state_file)), exist_ok=True)
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_file, state_file)
+
+
+def _find_text_body(payload):
+    """
+    Return the first text/plain body at any depth of the MIME tree.
+
+    Parts are walked iteratively in document order, so text nested in
+    multipart/alternative inside multipart/mixed is found, and only the
+    selected part is ever base64-decoded.
+    """
+    if "parts" not in payload:
+        body_data = payload.get("body", {}).get("data", "")
+        return _decode_body(body_data) if body_data else ""
+
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        if part.get("mimeType") == "text/plain":
+            body_data = part.get("body", {}).get("data", "")
+            if body_data:
+                return _decode_body(body_data)
+        # Reverse so the first child is visited first
+        stack.extend(reversed(part.get("parts", [])))
+    return ""
+
+
+def _decode_body(body_data):
+    return base64.urlsafe_b64decode(body_data).decode("utf-8", errors="replace").strip()
+
+
+def _parse_message(message):
+    """Extract the sender address and plain-text body from a Gmail message resource."""
+    payload = message.get("payload", {})
+    headers = payload.get("headers", [])
+
+    # Extract sender email
+    sender_email = ""
+    for header in headers:
+        if header["name"] == "From":
+            sender_email = header["value"]
+            sender_email = sender_email.split("<")[-1].replace(">", "").strip()  # Clean email format
+            break
+
+    # Extract message content, falling back to the snippet in metadata mode
+    email_body = _find_text_body(payload)
+    if not email_body and "snippet" in message:
+        email_body = html.unescape(message["snippet"]).strip()
 
-        return response_data
\ No newline at end of file
+    return {
+        "id": message.get("id"),
+        "thread_id": message.get("threadId"),
+        "sender": sender_email,
+        "body": email_body,
+    }
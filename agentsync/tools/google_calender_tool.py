@@ -1,51 +1,47 @@
-import os
+import time
 import datetime
-from typing import Dict, List, Any, Optional
 
-import google.auth
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+import agentsync.config as settings
+from agentsync.tools.calendar_store import CalendarStore, format_timestamp, parse_event_time
+from agentsync.tools.google_client import execute_batch, get_registry
+from agentsync.tools.idempotency import get_idempotency_store
+from agentsync.tools.lazy import LazyTool
+
+CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# Seconds a synced local store is trusted before the next incremental sync
+DEFAULT_SYNC_INTERVAL = 60
+# Window listed by a full sync; recurring events without an end are expanded only this far
+SYNC_PAST_DAYS = 30
+SYNC_FUTURE_DAYS = 365
 
 class GoogleCalendarTool:
-    def __init__(self, client_secret_file=None):
+    def __init__(self, client_secret_file=None, store_path=None, sync_interval=DEFAULT_SYNC_INTERVAL):
         """
         Initialize the Google Calendar Tool with authentication
         
         Args:
             client_secret_file: Path to the OAuth client secret file
+            store_path: Path of the local event store used by sync mode
+            sync_interval: Seconds the local store is used before it is synced again
         """
         # Use config from settings if not provided
         if client_secret_file is None:
-            import src.config as settings
             client_secret_file = settings.CLIENT_SECRET_FILE
-            
-        SCOPES = ["https://www.googleapis.com/auth/calendar"]
-        creds = None
 
-        # Check if token file exists
-        if os.path.exists(client_secret_file):
-            try:
-                creds = Credentials.from_authorized_user_file(client_secret_file, SCOPES)
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(google.auth.transport.requests.Request())  # Refresh expired token
-            except Exception as e:
-                print(f"⚠️ Error loading credentials: {e}")
-                creds = None  # Force re-authentication
-
-        # If credentials are not available, authenticate
-        if not creds or not creds.valid:
-            flow = InstalledAppFlow.from_client_secrets_file(client_secret_file, SCOPES)
-            creds = flow.run_local_server(port=0)
-            # Save new token
-            with open(client_secret_file, "w") as token:
-                token.write(creds.to_json())
-                
-        self.service = build("calendar", "v3", credentials=creds)
+        self.creds = get_registry().user_credentials(client_secret_file, CALENDAR_SCOPES)
+        self.store_path = store_path or settings.CALENDAR_STORE_FILE
+        self.sync_interval = sync_interval
+        self.store = None
         print("✅ Google Calendar API authenticated")
 
-    def create_event(self, summary, start_time, end_time, description="", location="", attendees=None):
+    @property
+    def service(self):
+        """Calendar service shared with every tool running on the calling thread."""
+        return get_registry().service("calendar", "v3", self.creds)
+
+    def create_event(self, summary, start_time, end_time, description="", location="", attendees=None,
+                     check_conflicts=False, idempotency_key=None):
         """
         Create a new calendar event
         
@@ -56,79 +52,79 @@ class GoogleCalendarTool:
             description: Description of the event
             location: Location of the event
             attendees: List of email addresses to invite
+            check_conflicts: Refuse to create the event if it overlaps a busy event
+            idempotency_key: Skip creation if an event was already created under this key
             
         Returns:
             Dict with event details or error message
         """
+        if idempotency_key is not None:
+            return get_idempotency_store().run(
+                idempotency_key,
+                lambda: self.create_event(summary, start_time, end_time, description, location,
+                                          attendees, check_conflicts)
+            )
         try:
-            event_body = {
-                'summary': summary,
-                'description': description,
-                'start': {'dateTime': start_time, 'timeZone': 'UTC'},
-                'end': {'dateTime': end_time, 'timeZone': 'UTC'},
-            }
-            
-            if location:
-                event_body['location'] = location
-                
-            if attendees:
-                event_body['attendees'] = [{'email': email} for email in attendees]
+            if check_conflicts:
+                conflicts = self.find_conflicts(start_time, end_time)
+                if not conflicts["success"]:
+                    return conflicts
+                if conflicts["conflicts"]:
+                    print(f"❌ Event '{summary}' conflicts with {len(conflicts['conflicts'])} event(s)")
+                    return {"success": False, "error": "Time slot conflicts with existing events",
+                            "conflicts": conflicts["conflicts"]}
+
+            event_body = _event_body(summary, start_time, end_time, description, location, attendees)
             
             # Create the event
             event = self.service.events().insert(calendarId='primary', body=event_body).execute()
+            if self.store is not None:
+                self.store.upsert(event)
+            _invalidate_cached_reads()
             
             print(f"✅ Event created: {summary}")
-            return {
-                "success": True,
-                "event_id": event.get('id'),
-                "link": event.get('htmlLink')
-            }
+            return _write_result(event)
             
         except HttpError as e:
             print(f"❌ Error creating event: {e}")
             return {"success": False, "error": str(e)}
 
-    def list_events(self, max_results=10):
+    def list_events(self, max_results=10, from_store=False):
         """
         List upcoming calendar events
         
         Args:
             max_results: Maximum number of events to return
+            from_store: Answer from the locally synced event store instead of the API
             
         Returns:
             Dict containing list of events or error message
         """
         try:
-            now = datetime.datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
-            
-            events_result = self.service.events().list(
-                calendarId='primary',
-                timeMin=now,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            if from_store:
+                store, error = self._synced_store()
+                if error is not None:
+                    return error
+                events = store.upcoming(time.time(), max_results)
+            else:
+                now = datetime.datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
+                
+                events_result = self.service.events().list(
+                    calendarId='primary',
+                    timeMin=now,
+                    maxResults=max_results,
+                    singleEvents=True,
+                    orderBy='startTime'
+                ).execute()
+                
+                events = events_result.get('items', [])
             
             if not events:
                 print("ℹ️ No upcoming events found")
                 return {"success": True, "events": []}
             
             # Format events
-            formatted_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                formatted_events.append({
-                    'id': event['id'],
-                    'summary': event.get('summary', 'Untitled Event'),
-                    'start': start,
-                    'end': end,
-                    'description': event.get('description', ''),
-                    'location': event.get('location', '')
-                })
+            formatted_events = [_format_event(event) for event in events]
             
             print(f"✅ Retrieved {len(formatted_events)} events")
             return {"success": True, "events": formatted_events}
@@ -137,6 +133,127 @@ class GoogleCalendarTool:
             print(f"❌ Error listing events: {e}")
             return {"success": False, "error": str(e)}
 
+    def sync_events(self):
+        """
+        Bring the local event store up to date using syncToken incremental sync
+        
+        The first call (or a call after the token expired) lists every event
+        from SYNC_PAST_DAYS ago to SYNC_FUTURE_DAYS ahead; later calls only
+        transfer events changed since the previous sync. Once half of the
+        future window has passed, a full sync moves it forward. The store is
+        locked for the whole sync, so concurrent callers wait for it.
+        
+        Returns:
+            Dict with success status and the number of changed events
+        """
+        store = self._get_store()
+        with store.lock:
+            try:
+                if store.window_end is None or store.window_end - time.time() < SYNC_FUTURE_DAYS * 86400 / 2:
+                    store.clear()
+                try:
+                    changed = self._pull_changes(store)
+                except HttpError as e:
+                    if e.resp.status != 410:
+                        raise
+                    print("⚠️ Calendar sync token expired, running a full resync")
+                    store.clear()
+                    changed = self._pull_changes(store)
+                store.last_synced = time.time()
+                store.save()
+                return {"success": True, "changed": changed}
+            except HttpError as e:
+                print(f"❌ Error syncing events: {e}")
+                return {"success": False, "error": str(e)}
+
+    def find_conflicts(self, start_time, end_time):
+        """
+        Find busy events overlapping a time range, answered from the local store
+        
+        Args:
+            start_time: Start time in ISO format (naive times are taken as UTC)
+            end_time: End time in ISO format
+            
+        Returns:
+            Dict with the list of conflicting events or error message
+        """
+        store, error = self._synced_store()
+        if error is not None:
+            return error
+        start, end = _parse_range(start_time, end_time)
+        if end > store.window_end:
+            return {"success": False, "error": f"Calendar store only covers events until {format_timestamp(store.window_end)}"}
+        return {"success": True, "conflicts": [_format_event(event) for event in store.overlapping(start, end, busy_only=True)]}
+
+    def free_busy(self, start_time, end_time):
+        """
+        Return merged busy intervals within a time range, answered from the local store
+        
+        Args:
+            start_time: Start time in ISO format (naive times are taken as UTC)
+            end_time: End time in ISO format
+            
+        Returns:
+            Dict with the list of busy intervals or error message
+        """
+        store, error = self._synced_store()
+        if error is not None:
+            return error
+        start, end = _parse_range(start_time, end_time)
+        if end > store.window_end:
+            return {"success": False, "error": f"Calendar store only covers events until {format_timestamp(store.window_end)}"}
+        busy = [{"start": format_timestamp(s), "end": format_timestamp(e)} for s, e in store.busy_intervals(start, end)]
+        return {"success": True, "busy": busy}
+
+    def _get_store(self):
+        if self.store is None:
+            self.store = CalendarStore(self.store_path)
+        return self.store
+
+    def _synced_store(self):
+        """
+        Return the local store, syncing it first when it is older than ``sync_interval``.
+
+        Returns:
+            Tuple of (store, failed sync result or None)
+        """
+        store = self._get_store()
+        with store.lock:
+            # Checked under the lock, so callers waiting on another thread's sync do not repeat it
+            if store.sync_token is None or time.time() - store.last_synced > self.sync_interval:
+                result = self.sync_events()
+                if not result["success"]:
+                    return store, result
+        return store, None
+
+    def _pull_changes(self, store):
+        """Page through events().list, applying changes to the store; returns the number of items."""
+        page_token = None
+        changed = 0
+        window_end = None
+        while True:
+            params = {"calendarId": "primary", "singleEvents": True, "maxResults": 2500, "pageToken": page_token}
+            if store.sync_token:
+                params["syncToken"] = store.sync_token
+            else:
+                # Incremental requests must not repeat the window; their sync token carries it
+                now = time.time()
+                window_end = window_end or now + SYNC_FUTURE_DAYS * 86400
+                params["timeMin"] = format_timestamp(now - SYNC_PAST_DAYS * 86400)
+                params["timeMax"] = format_timestamp(window_end)
+            result = self.service.events().list(**params).execute()
+
+            items = result.get("items", [])
+            store.apply(items)
+            changed += len(items)
+
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                store.sync_token = result.get("nextSyncToken")
+                if window_end is not None:
+                    store.window_end = window_end
+                return changed
+
     def delete_event(self, event_id):
         """
         Delete a calendar event
@@ -149,6 +266,9 @@ class GoogleCalendarTool:
         """
         try:
             self.service.events().delete(calendarId='primary', eventId=event_id).execute()
+            if self.store is not None:
+                self.store.remove(event_id)
+            _invalidate_cached_reads()
             print(f"✅ Event {event_id} deleted")
             return {"success": True}
         except HttpError as e:
@@ -156,10 +276,14 @@ class GoogleCalendarTool:
             return {"success": False, "error": str(e)}
 
     def update_event(self, event_id, summary=None, start_time=None, end_time=None, 
-                    description=None, location=None):
+                    description=None, location=None, attendees=None, etag=None, time_zone=None):
         """
         Update an existing calendar event
         
+        Only the fields that are provided are sent, as a single events().patch call;
+        empty strings are ignored and times keep the event's own time zone unless
+        ``time_zone`` is given.
+        
         Args:
             event_id: ID of the event to update
             summary: New title of the event
@@ -167,47 +291,199 @@ class GoogleCalendarTool:
             end_time: New end time in ISO format
             description: New description of the event
             location: New location of the event
+            attendees: New list of email addresses to invite
+            etag: Only apply the update if the event still has this ETag
+            time_zone: IANA time zone of the new start and end times, e.g. "Europe/Berlin"
             
         Returns:
             Dict with updated event details or error message
         """
         try:
-            # Get the existing event
-            event = self.service.events().get(calendarId='primary', eventId=event_id).execute()
-            
-            # Update fields that are provided
-            if summary:
-                event['summary'] = summary
-            if description:
-                event['description'] = description
-            if location:
-                event['location'] = location
-            if start_time:
-                event['start']['dateTime'] = start_time
-            if end_time:
-                event['end']['dateTime'] = end_time
-            
-            # Update the event
-            updated_event = self.service.events().update(
-                calendarId='primary', eventId=event_id, body=event
-            ).execute()
+            request = self._patch_request(event_id, etag, summary=summary, start_time=start_time,
+                                          end_time=end_time, description=description,
+                                          location=location, attendees=attendees, time_zone=time_zone)
+            updated_event = request.execute()
+            if self.store is not None:
+                self.store.upsert(updated_event)
+            _invalidate_cached_reads()
             
             print(f"✅ Event updated: {updated_event.get('summary')}")
-            return {
-                "success": True, 
-                "event_id": updated_event.get('id'),
-                "link": updated_event.get('htmlLink')
-            }
+            return _write_result(updated_event)
             
         except HttpError as e:
+            if e.resp.status == 412:
+                print(f"❌ Event {event_id} was modified since it was read")
+                return {"success": False, "error": "Event was modified since it was read (ETag mismatch)"}
             print(f"❌ Error updating event: {e}")
             return {"success": False, "error": str(e)}
 
+    def create_events(self, events):
+        """
+        Create many events through Google batch HTTP requests
+        
+        Args:
+            events: List of dicts holding ``create_event`` keyword arguments
+                (summary, start_time, end_time and optionally description,
+                location, attendees)
+            
+        Returns:
+            List of per-event result dicts, in the order of ``events``
+        """
+        requests = [
+            self.service.events().insert(calendarId='primary', body=_event_body(**event))
+            for event in events
+        ]
+        # Inserts are not idempotent: a 5xx may follow a successful insert, so it is not retried
+        results = self._run_batch(requests, "creating", transient=False)
+        print(f"✅ Created {sum(r['success'] for r in results)}/{len(results)} events")
+        return results
+
+    def update_events(self, updates):
+        """
+        Patch many events through Google batch HTTP requests
+        
+        Args:
+            updates: List of dicts holding ``update_event`` keyword arguments,
+                each with an ``event_id`` and optionally an ``etag``
+            
+        Returns:
+            List of per-event result dicts, in the order of ``updates``
+        """
+        requests = []
+        for update in updates:
+            fields = dict(update)
+            requests.append(self._patch_request(fields.pop('event_id'), fields.pop('etag', None), **fields))
+        results = self._run_batch(requests, "updating")
+        print(f"✅ Updated {sum(r['success'] for r in results)}/{len(results)} events")
+        return results
+
+    def delete_events(self, event_ids):
+        """
+        Delete many events through Google batch HTTP requests
+        
+        Args:
+            event_ids: List of IDs of the events to delete
+            
+        Returns:
+            List of per-event result dicts, in the order of ``event_ids``
+        """
+        requests = [self.service.events().delete(calendarId='primary', eventId=event_id) for event_id in event_ids]
+        results = []
+        # A delete resent after a lost response finds the event already gone
+        batch = execute_batch(self.service, requests, applied_statuses=(404, 410))
+        for event_id, (_, error) in zip(event_ids, batch):
+            if error is None:
+                if self.store is not None:
+                    self.store.remove(event_id)
+                results.append({"success": True, "event_id": event_id})
+            else:
+                print(f"❌ Error deleting event {event_id}: {error}")
+                results.append({"success": False, "event_id": event_id, "error": str(error)})
+        if any(r["success"] for r in results):
+            _invalidate_cached_reads()
+        print(f"✅ Deleted {sum(r['success'] for r in results)}/{len(results)} events")
+        return results
+
+    def _patch_request(self, event_id, etag=None, **fields):
+        request = self.service.events().patch(calendarId='primary', eventId=event_id, body=_patch_body(**fields))
+        if etag:
+            request.headers['If-Match'] = etag
+        return request
+
+    def _run_batch(self, requests, action, transient=True):
+        """Execute insert/patch requests in batches, updating the store and formatting results."""
+        results = []
+        for response, error in execute_batch(self.service, requests, transient=transient):
+            if error is None:
+                if self.store is not None:
+                    self.store.upsert(response)
+                results.append(_write_result(response))
+            else:
+                print(f"❌ Error {action} event: {error}")
+                results.append({"success": False, "error": str(error)})
+        if any(r["success"] for r in results):
+            _invalidate_cached_reads()
+        return results
+
+
+def _invalidate_cached_reads():
+    """Drop memoized calendar reads (list_events, free_busy, ...) after a write."""
+    from agentsync.tools.memoize import invalidate
+
+    invalidate("calendar")
+
+
+def _event_body(summary, start_time, end_time, description="", location="", attendees=None):
+    """Build the events().insert body for a new event."""
+    event_body = {
+        'summary': summary,
+        'description': description,
+        'start': {'dateTime': start_time, 'timeZone': 'UTC'},
+        'end': {'dateTime': end_time, 'timeZone': 'UTC'},
+    }
+    
+    if location:
+        event_body['location'] = location
+        
+    if attendees:
+        event_body['attendees'] = [{'email': email} for email in attendees]
+    return event_body
+
+
+def _patch_body(summary=None, start_time=None, end_time=None, description=None, location=None, attendees=None,
+                time_zone=None):
+    """Build an events().patch body holding only the fields that are provided."""
+    body = {}
+    if summary:
+        body['summary'] = summary
+    if description:
+        body['description'] = description
+    if location:
+        body['location'] = location
+    # Patch merges nested objects, so without a time zone the event keeps its own
+    for field, value in (('start', start_time), ('end', end_time)):
+        if value:
+            body[field] = {'dateTime': value}
+            if time_zone:
+                body[field]['timeZone'] = time_zone
+    if attendees is not None:
+        body['attendees'] = [{'email': email} for email in attendees]
+    return body
+
+
+def _write_result(event):
+    return {
+        "success": True,
+        "event_id": event.get('id'),
+        "etag": event.get('etag'),
+        "link": event.get('htmlLink')
+    }
+
+
+def _format_event(event):
+    start = event['start'].get('dateTime', event['start'].get('date'))
+    end = event['end'].get('dateTime', event['end'].get('date'))
+    return {
+        'id': event['id'],
+        'summary': event.get('summary', 'Untitled Event'),
+        'start': start,
+        'end': end,
+        'description': event.get('description', ''),
+        'location': event.get('location', '')
+    }
+
+
+def _parse_range(start_time, end_time):
+    return parse_event_time({"dateTime": start_time}), parse_event_time({"dateTime": end_time})
+
 
 # For LangGraph integration
 def get_calendar_tools():
-    """Return calendar tools formatted for LangGraph"""
-    calendar = GoogleCalendarTool()
+    """Return calendar tools formatted for LangGraph
+
+    Authentication is deferred until one of the tools is first invoked.
+    """
+    calendar = LazyTool(GoogleCalendarTool)
     
     return {
         "schedule_event": {
@@ -236,6 +512,18 @@ def get_calendar_tools():
                 }
             }
         },
+        "check_availability": {
+            "description": "List busy time ranges in your Google Calendar between two times",
+            "function": lambda kwargs: calendar.free_busy(**kwargs),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "start_time": {"type": "string", "description": "Start time (YYYY-MM-DDTHH:MM:SS)"},
+                    "end_time": {"type": "string", "description": "End time (YYYY-MM-DDTHH:MM:SS)"}
+                },
+                "required": ["start_time", "end_time"]
+            }
+        },
         "cancel_event": {
             "description": "Cancel (delete) an event from your calendar",
             "function": lambda kwargs: calendar.delete_event(**kwargs),
@@ -0,0 +1,241 @@
+import os
+import json
+import time
+import datetime
+import threading
+from googleapiclient.errors import HttpError
+from agentsync.tools.rate_limiter import backoff_delay
+
+# Refresh access tokens this many seconds before they expire
+REFRESH_MARGIN_SECONDS = 300
+# Delay before retrying a failed refresh
+REFRESH_RETRY_SECONDS = 60
+# Calls per batch HTTP request; Google recommends at most 50 to avoid rate limiting
+BATCH_SIZE = 50
+
+
+class GoogleClientRegistry:
+    """
+    Process-wide, thread-safe cache of Google credentials and API clients.
+
+    Credentials are loaded once per (file, scopes) pair and refreshed shortly
+    before they expire, under the registry lock when a tool next asks for its
+    service, so no thread refreshes them while another one is doing the same.
+    Service objects are built from the static discovery documents bundled
+    with googleapiclient and cached per thread, because the underlying
+    httplib2 connection is not thread-safe; every tool running on the same
+    thread shares the same service and keep-alive connection.
+
+    The google-auth and discovery modules are imported on first use rather
+    than with this module, as together they take a few hundred milliseconds.
+    """
+
+    def __init__(self, refresh_margin=REFRESH_MARGIN_SECONDS):
+        self.refresh_margin = refresh_margin
+        self._lock = threading.RLock()
+        self._credentials = {}
+        # id(creds) -> time before which a failed refresh is not attempted again
+        self._retry_after = {}
+        self._local = threading.local()
+
+    def user_credentials(self, client_secret_file, scopes):
+        """
+        Return cached OAuth user credentials, running the consent flow if needed.
+
+        Args:
+            client_secret_file: Path to the authorized-user token / client secret file.
+            scopes: OAuth scopes required by the caller.
+        """
+        key = ("user", os.path.abspath(client_secret_file), tuple(sorted(scopes)))
+        with self._lock:
+            if key not in self._credentials:
+                self._credentials[key] = _load_user_credentials(client_secret_file, scopes)
+            return self._credentials[key]
+
+    def service_account_credentials(self, credentials_file, scopes):
+        """
+        Return cached service account credentials.
+
+        No token is fetched here; the first ``service()`` call obtains one.
+
+        Args:
+            credentials_file: Path to the service account JSON key.
+            scopes: OAuth scopes required by the caller.
+        """
+        key = ("service_account", os.path.abspath(credentials_file), tuple(sorted(scopes)))
+        with self._lock:
+            if key not in self._credentials:
+                from google.oauth2 import service_account
+
+                self._credentials[key] = service_account.Credentials.from_service_account_file(
+                    credentials_file, scopes=scopes
+                )
+            return self._credentials[key]
+
+    def service(self, api, version, creds):
+        """
+        Return the calling thread's service object for the given API and credentials.
+
+        Args:
+            api: API name, e.g. "gmail".
+            version: API version, e.g. "v1".
+            creds: Credentials obtained from this registry.
+        """
+        self._refresh_if_expiring(creds)
+        services = getattr(self._local, "services", None)
+        if services is None:
+            services = self._local.services = {}
+        key = (api, version, id(creds))
+        if key not in services:
+            from googleapiclient.discovery import build
+
+            services[key] = build(api, version, credentials=creds, static_discovery=True, cache_discovery=False)
+        return services[key]
+
+    def _refresh_if_expiring(self, creds):
+        """Obtain a first token, or refresh one within ``refresh_margin`` of expiry, one thread at a time."""
+        if not self._needs_refresh(creds):
+            return
+        with self._lock:
+            # Another thread may have refreshed them while this one waited
+            if not self._needs_refresh(creds) or time.monotonic() < self._retry_after.get(id(creds), 0):
+                return
+            from google.auth.transport.requests import Request
+
+            try:
+                creds.refresh(Request())
+                self._retry_after.pop(id(creds), None)
+            except Exception as e:
+                print(f"⚠️ Token refresh failed: {e}")
+                self._retry_after[id(creds)] = time.monotonic() + REFRESH_RETRY_SECONDS
+
+    def _needs_refresh(self, creds):
+        if not getattr(creds, "token", None):
+            return True
+        return getattr(creds, "expiry", None) is not None and _seconds_left(creds) <= self.refresh_margin
+
+
+def _seconds_left(creds):
+    """Seconds until the credentials expire; google-auth stores expiry as naive UTC."""
+    expiry = creds.expiry
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=datetime.timezone.utc)
+    return (expiry - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+
+
+def _load_user_credentials(client_secret_file, scopes):
+    """Load OAuth user credentials from disk, refreshing or re-authenticating as needed."""
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    creds = None
+
+    # Check if token file exists
+    if os.path.exists(client_secret_file):
+        try:
+            creds = Credentials.from_authorized_user_file(client_secret_file, scopes)
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())  # Refresh expired token
+        except Exception as e:
+            print(f"⚠️ Error loading credentials: {e}")
+            creds = None  # Force re-authentication
+
+    # If credentials are not available, authenticate
+    if not creds or not creds.valid:
+        flow = InstalledAppFlow.from_client_secrets_file(client_secret_file, scopes)
+        creds = flow.run_local_server(port=0)
+        # Save new token
+        with open(client_secret_file, "w") as token:
+            token.write(creds.to_json())
+
+    return creds
+
+
+def is_retryable(error, transient=True):
+    """
+    Whether an HttpError is a rate-limit or transient server error worth retrying.
+
+    Args:
+        error: The HttpError raised by the call.
+        transient: Also retry 5xx errors. Pass False for calls that are not
+            idempotent (sending mail, inserting events): a 5xx may arrive after
+            the server already applied the call, and resending would duplicate it.
+    """
+    status = error.resp.status
+    if status == 429 or (transient and status >= 500):
+        return True
+    if status == 403:
+        try:
+            details = json.loads(error.content).get("error", {}).get("errors", [])
+        except (ValueError, AttributeError):
+            return False
+        return any(d.get("reason") in ("rateLimitExceeded", "userRateLimitExceeded") for d in details)
+    return False
+
+
+def execute_batch(service, requests, batch_size=BATCH_SIZE, max_retries=3, transient=True, applied_statuses=()):
+    """
+    Execute API requests through batch HTTP requests, retrying rate-limited items.
+
+    A failure of a whole batch HTTP request is reported for each of its items
+    instead of being raised: an HttpError is retried like theirs, a transport
+    error (timeout, dropped connection) is reported as is.
+
+    Args:
+        service: Service object the requests were built from.
+        requests: List of HttpRequest objects, e.g. ``service.events().insert(...)``.
+        batch_size: Number of calls sent per batch HTTP request.
+        max_retries: Times a rate-limited or transiently failing call is resent.
+        transient: Also retry 5xx errors; pass False for non-idempotent calls such as inserts.
+        applied_statuses: Error statuses meaning a resent call already took effect, e.g.
+            (404, 410) for deletes; they are reported as success on a retry.
+
+    Returns:
+        List of (response, exception) tuples in the order of ``requests``;
+        exactly one of the two is None.
+    """
+    from httplib2 import HttpLib2Error
+
+    results = [None] * len(requests)
+    pending = list(range(len(requests)))
+    attempt = 0
+    while pending:
+        retry = []
+
+        def collect(request_id, response, exception):
+            index = int(request_id)
+            if isinstance(exception, HttpError) and attempt < max_retries and is_retryable(exception, transient):
+                retry.append(index)
+            elif attempt and isinstance(exception, HttpError) and exception.resp.status in applied_statuses:
+                # Only retried items are pending after the first attempt
+                results[index] = (response, None)
+            else:
+                results[index] = (response, exception)
+
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            batch = service.new_batch_http_request(callback=collect)
+            for index in chunk:
+                batch.add(requests[index], request_id=str(index))
+            try:
+                batch.execute()
+            except (HttpError, HttpLib2Error, OSError) as e:
+                # The batch request itself failed; items already answered keep their result
+                for index in chunk:
+                    if results[index] is None and index not in retry:
+                        collect(str(index), None, e)
+
+        if retry:
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+        pending = sorted(retry)
+    return results
+
+
+_registry = GoogleClientRegistry()
+
+
+def get_registry():
+    """Return the process-wide Google client registry."""
+    return _registry
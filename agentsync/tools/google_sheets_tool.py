@@ -1,21 +1,100 @@
-from googleapiclient.discovery import build
-from google.oauth2.service_account import Credentials
+import os
+import gzip
+import json
+import hashlib
+import threading
 import agentsync.config as settings
+from agentsync.tools.google_client import get_registry
+from agentsync.tools.idempotency import get_idempotency_store
+
+SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
 class GoogleSheetsTool:
     def __init__(self):
         """Initialize Google Sheets API client"""
-        creds = Credentials.from_service_account_file(settings.GOOGLE_CREDENTIALS_FILE)
-        self.service = build("sheets", "v4", credentials=creds)
-        self.sheet = self.service.spreadsheets()
+        self.creds = get_registry().service_account_credentials(settings.GOOGLE_CREDENTIALS_FILE, SHEETS_SCOPES)
+
+    @property
+    def service(self):
+        """Sheets service shared with every tool running on the calling thread."""
+        return get_registry().service("sheets", "v4", self.creds)
+
+    @property
+    def sheet(self):
+        return self.service.spreadsheets()
 
     def read_sheet(self, range="Sheet1!A2:H"):
         """Fetch lead data from Google Sheets."""
         result = self.sheet.values().get(spreadsheetId=settings.SHEET_ID, range=range).execute()
         return result.get("values", [])
 
-    def update_sheet(self, row, col, value):
-        """Update a specific lead field in Google Sheets."""
+    def iter_rows(self, sheet="Sheet1", start_row=2, start_col="A", end_col="H", window=1000):
+        """
+        Stream sheet rows lazily in fixed row windows.
+
+        Args:
+            sheet: Name of the sheet to read.
+            start_row: First row to read (1-based).
+            start_col: First column of the range.
+            end_col: Last column of the range.
+            window: Number of rows requested per API call.
+
+        Yields:
+            Tuples of (row_number, row_values); empty rows yield an empty list.
+        """
+        row_count = self._row_count(sheet)
+        for first in range(start_row, row_count + 1, window):
+            last = min(first + window - 1, row_count)
+            result = self.sheet.values().get(
+                spreadsheetId=settings.SHEET_ID,
+                range=f"{sheet}!{start_col}{first}:{end_col}{last}"
+            ).execute()
+            for offset, row in enumerate(result.get("values", [])):
+                yield first + offset, row
+
+    def read_changed_rows(self, sheet="Sheet1", start_row=2, end_col="H", snapshot_path=None, window=1000):
+        """
+        Stream only the rows that changed since the last local snapshot.
+
+        Rows are compared by a content hash against a columnar snapshot stored
+        under STATE_DIR; the snapshot is replaced once the sheet has been read
+        to the end.
+
+        Args:
+            sheet: Name of the sheet to read.
+            start_row: First row to read (1-based).
+            end_col: Last column of the range.
+            snapshot_path: Location of the snapshot file.
+            window: Number of rows requested per API call.
+
+        Yields:
+            Tuples of (row_number, row_values) for new or modified rows.
+        """
+        if snapshot_path is None:
+            snapshot_path = os.path.join(settings.STATE_DIR, f"sheet_{settings.SHEET_ID}_{sheet}.json.gz")
+        snapshot = SheetSnapshot(snapshot_path)
+        yield from snapshot.update(self.iter_rows(sheet, start_row, "A", end_col, window))
+
+    def _row_count(self, sheet):
+        """Return the number of rows in the sheet's grid."""
+        result = self.sheet.get(
+            spreadsheetId=settings.SHEET_ID,
+            fields="sheets(properties(title,gridProperties/rowCount))"
+        ).execute()
+        for entry in result.get("sheets", []):
+            properties = entry.get("properties", {})
+            if properties.get("title") == sheet:
+                return properties.get("gridProperties", {}).get("rowCount", 0)
+        raise ValueError(f"❌ Error: Sheet '{sheet}' not found.")
+
+    def update_sheet(self, row, col, value, idempotency_key=None):
+        """Update a specific lead field in Google Sheets.
+
+        With an ``idempotency_key``, an update already applied under the same
+        key is not applied again, so a replay cannot overwrite later changes.
+        """
+        if idempotency_key is not None:
+            return get_idempotency_store().run(idempotency_key, lambda: self.update_sheet(row, col, value))
         range_ = f"Sheet1!{col}{row}"
         body = {"values": [[value]]}
         self.sheet.values().update(
@@ -24,4 +103,280 @@ class GoogleSheetsTool:
             valueInputOption="RAW",
             body=body
         ).execute()
-        print(f"Updated row {row}, column {col} with '{value}'")
\ No newline at end of file
+        _invalidate_cached_reads()
+        print(f"Updated row {row}, column {col} with '{value}'")
+
+    def buffered_writer(self, sheet="Sheet1", max_pending=500, max_delay=5.0):
+        """
+        Create a write-behind buffer that batches cell updates for this spreadsheet.
+
+        Args:
+            sheet: Name of the sheet the updates target.
+            max_pending: Flush once this many distinct cells are pending.
+            max_delay: Flush this many seconds after the first pending write (None disables).
+
+        Returns:
+            A SheetsWriteBuffer, usable as a context manager that flushes on exit.
+        """
+        return SheetsWriteBuffer(self, sheet=sheet, max_pending=max_pending, max_delay=max_delay)
+
+
+class SheetsWriteBuffer:
+    """
+    Write-behind buffer that coalesces cell and row updates into values().batchUpdate calls.
+
+    Repeated writes to the same cell keep only the latest value, and adjacent
+    cells are merged into rectangular ranges before being sent. Pending updates
+    are flushed when ``max_pending`` cells are buffered, ``max_delay`` seconds
+    after the first pending write, on ``flush()`` or on context-manager exit.
+    """
+
+    def __init__(self, tool, sheet="Sheet1", max_pending=500, max_delay=5.0, value_input_option="RAW"):
+        self.tool = tool
+        self.sheet = sheet
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.value_input_option = value_input_option
+        self.writes = 0
+        self.api_calls = 0
+        self._pending = {}
+        self._lock = threading.RLock()
+        # Held while a batch is sent, so flushes reach the sheet in order; writers never wait on it
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    def update_cell(self, row, col, value):
+        """Buffer an update of a single cell, e.g. ``update_cell(5, "C", "verified")``."""
+        with self._lock:
+            self._pending[(int(row), _col_to_index(col))] = value
+            self.writes += 1
+            full = self._after_write()
+        if full:
+            self.flush()
+
+    def update_row(self, row, values, start_col="A"):
+        """Buffer an update of consecutive cells of one row starting at ``start_col``."""
+        with self._lock:
+            start = _col_to_index(start_col)
+            for offset, value in enumerate(values):
+                self._pending[(int(row), start + offset)] = value
+            self.writes += 1
+            full = self._after_write()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Send all pending updates in a single values().batchUpdate call.
+
+        The pending updates are taken out of the buffer before the request is
+        sent, so writers are not blocked by it; if it fails they are merged
+        back under any newer writes to the same cells.
+
+        Returns:
+            Number of merged ranges written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    return 0
+                pending, self._pending = self._pending, {}
+
+            data = _merge_ranges(self.sheet, pending)
+            try:
+                self.tool.sheet.values().batchUpdate(
+                    spreadsheetId=settings.SHEET_ID,
+                    body={"valueInputOption": self.value_input_option, "data": data}
+                ).execute()
+            except BaseException:
+                with self._lock:
+                    for cell, value in pending.items():
+                        self._pending.setdefault(cell, value)
+                raise
+            with self._lock:
+                self.api_calls += 1
+            cells = len(pending)
+        _invalidate_cached_reads()
+
+        print(f"Flushed {cells} cells in {len(data)} ranges with one batchUpdate")
+        return len(data)
+
+    def stats(self):
+        """Return write counters, including the API calls saved versus one call per write."""
+        with self._lock:
+            return {
+                "writes": self.writes,
+                "api_calls": self.api_calls,
+                "saved_calls": self.writes - self.api_calls,
+                "pending_cells": len(self._pending),
+            }
+
+    def _after_write(self):
+        """Return whether the buffer is full; otherwise make sure a delayed flush is scheduled."""
+        if len(self._pending) >= self.max_pending:
+            return True
+        self._schedule()
+        return False
+
+    def _schedule(self):
+        """Start the delayed flush unless one is already pending."""
+        if self._timer is None and self.max_delay is not None:
+            self._timer = threading.Timer(self.max_delay, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            # Pending updates are kept; try again after another delay instead of waiting for the next write
+            print(f"❌ Error flushing buffered sheet updates: {e}")
+            with self._lock:
+                if self._pending:
+                    self._schedule()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        stats = self.stats()
+        print(f"✅ Sheets buffer closed: {stats['writes']} writes in {stats['api_calls']} API calls "
+              f"({stats['saved_calls']} saved)")
+
+
+class SheetSnapshot:
+    """
+    Local columnar snapshot of sheet rows with a content hash per row.
+
+    Values are stored column by column (one list per column) in a gzipped JSON
+    file, next to the row numbers and a short BLAKE2 hash of every row.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.row_numbers = []
+        self.columns = []
+        self.hashes = []
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            self.row_numbers = data["row_numbers"]
+            self.columns = data["columns"]
+            self.hashes = data["hashes"]
+
+    def rows(self):
+        """Yield (row_number, row_values) from the snapshot without any API call."""
+        for i, row_number in enumerate(self.row_numbers):
+            row = [column[i] for column in self.columns]
+            while row and row[-1] == "":
+                row.pop()
+            yield row_number, row
+
+    def update(self, rows):
+        """
+        Diff freshly read rows against the snapshot, yielding new or changed ones.
+
+        The snapshot is rebuilt from ``rows`` and saved once they are exhausted.
+        """
+        previous = dict(zip(self.row_numbers, self.hashes))
+        row_numbers, columns, hashes = [], [], []
+
+        for row_number, row in rows:
+            row_hash = _row_hash(row)
+            if previous.get(row_number) != row_hash:
+                yield row_number, row
+
+            # Grow the column set on demand and pad every column to the same length
+            while len(columns) < len(row):
+                columns.append([""] * len(row_numbers))
+            for i, column in enumerate(columns):
+                column.append(row[i] if i < len(row) else "")
+            row_numbers.append(row_number)
+            hashes.append(row_hash)
+
+        self.row_numbers, self.columns, self.hashes = row_numbers, columns, hashes
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"row_numbers": self.row_numbers, "columns": self.columns, "hashes": self.hashes}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _invalidate_cached_reads():
+    """Drop memoized sheet reads after a write."""
+    from agentsync.tools.memoize import invalidate
+
+    invalidate("sheet")
+
+
+def _row_hash(row):
+    return hashlib.blake2b("\x1f".join(map(str, row)).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _col_to_index(col):
+    """Convert a column letter such as "A" or "AB" to its 1-based index."""
+    index = 0
+    for char in col.upper():
+        index = index * 26 + (ord(char) - ord("A") + 1)
+    return index
+
+
+def _index_to_col(index):
+    """Convert a 1-based column index back to its column letter."""
+    col = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        col = chr(ord("A") + remainder) + col
+    return col
+
+
+def _merge_ranges(sheet, cells):
+    """
+    Merge ``{(row, col_index): value}`` into rectangular A1 ranges.
+
+    Consecutive columns of a row become one run, and runs spanning the same
+    columns on consecutive rows are stacked into one block.
+    """
+    rows = {}
+    for (row, col), value in cells.items():
+        rows.setdefault(row, {})[col] = value
+
+    blocks = []
+    open_blocks = {}
+    for row in sorted(rows):
+        row_cells = rows[row]
+        cols = sorted(row_cells)
+        runs = []
+        for col in cols:
+            if runs and col == runs[-1][0] + len(runs[-1][1]):
+                runs[-1][1].append(row_cells[col])
+            else:
+                runs.append((col, [row_cells[col]]))
+
+        for start_col, values in runs:
+            key = (start_col, len(values))
+            block = open_blocks.get(key)
+            if block is not None and block["end_row"] == row - 1:
+                block["end_row"] = row
+                block["values"].append(values)
+            else:
+                block = {"start_row": row, "end_row": row, "start_col": start_col, "values": [values]}
+                blocks.append(block)
+                open_blocks[key] = block
+
+    data = []
+    for block in blocks:
+        end_col = block["start_col"] + len(block["values"][0]) - 1
+        data.append({
+            "range": f"{sheet}!{_index_to_col(block['start_col'])}{block['start_row']}:"
+                     f"{_index_to_col(end_col)}{block['end_row']}",
+            "values": block["values"],
+        })
+    return data
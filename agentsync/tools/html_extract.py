@@ -0,0 +1,189 @@
+import re
+from lxml import etree
+from lxml import html as lxml_html
+
+# Elements that never carry article content
+BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "nav", "aside",
+    "iframe", "svg", "button", "template", "select", "input", "textarea",
+)
+# Wrappers unwrapped rather than removed: ASP.NET and many CMS pages put the whole body in a <form>
+UNWRAPPED_TAGS = ("form",)
+# Page-level headers and footers; inside <article>/<main> they hold the title and byline instead
+PAGE_CHROME_TAGS = ("header", "footer")
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "dialog"}
+# Whole class / id tokens marking menus, sidebars, cookie banners and the like. Only exact
+# tokens count, so wrappers such as "layout-with-sidebar" or "has-comments" are kept.
+BOILERPLATE_TOKENS = frozenset({
+    "nav", "navbar", "navigation", "menu", "main-menu", "site-nav", "site-header", "site-footer",
+    "footer", "header", "sidebar", "breadcrumb", "breadcrumbs", "cookie", "cookies", "cookie-banner",
+    "consent", "banner", "advert", "ads", "ad", "promo", "social", "share", "sharing", "share-buttons",
+    "comments", "comment-list", "related", "related-posts", "subscribe", "newsletter", "popup", "modal",
+})
+# Blocks rendered as a single paragraph without descending further
+LEAF_BLOCKS = {"p", "li", "pre", "blockquote", "dt", "dd", "figcaption", "caption", "td", "th",
+               "h1", "h2", "h3", "h4", "h5", "h6"}
+CONTENT_TAGS = ("p", "pre", "blockquote", "td")
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+# Paragraphs shorter than this do not count towards a block's content score
+MIN_PARAGRAPH_CHARS = 25
+
+
+def markdownify_extract(html: str) -> str:
+    """Convert the whole document with markdownify (thorough but slow)."""
+    from markdownify import markdownify
+
+    content = markdownify(html).strip()
+    return re.sub(r"\n{3,}", "\n\n", content)
+
+
+def lxml_extract(html: str) -> str:
+    """
+    Extract the main content of a page as markdown-lite using lxml.
+
+    Scripts, navigation and other boilerplate are stripped, the main content
+    block is located (``<main>``, ``<article>`` or the element holding the most
+    paragraph text) and rendered as headings, paragraphs, list items, quotes,
+    code blocks and inline links.
+    """
+    if not html or not html.strip():
+        return ""
+    # lxml refuses str input carrying an XML encoding declaration
+    html = XML_DECLARATION.sub("", html, count=1)
+    try:
+        root = lxml_html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+
+    etree.strip_elements(root, etree.Comment, *BOILERPLATE_TAGS, with_tail=False)
+    for element in list(root.iter(*UNWRAPPED_TAGS)):
+        if element is not root:
+            element.drop_tag()
+    for element in root.xpath(" | ".join(f"//{tag}" for tag in PAGE_CHROME_TAGS)):
+        if not any(ancestor.tag in ("article", "main") for ancestor in element.iterancestors()):
+            element.drop_tree()
+
+    # The best content block and its ancestors survive whatever their class says
+    main = _find_main(root)
+    protected = {main, *main.iterancestors()}
+    for element in root.xpath("//*[@class or @id or @role]"):
+        if element in protected or element.tag in ("html", "body", "main", "article", *PAGE_CHROME_TAGS):
+            continue
+        if element.getroottree().getroot() is not root:
+            # Inside an element dropped earlier in this loop
+            continue
+        if element.get("role") in BOILERPLATE_ROLES or _is_boilerplate(element):
+            element.drop_tree()
+
+    blocks = _render_blocks(_find_main(root))
+    return "\n\n".join(blocks)
+
+
+def _is_boilerplate(element):
+    tokens = f"{element.get('class', '')} {element.get('id', '')}".lower().split()
+    return any(token in BOILERPLATE_TOKENS for token in tokens)
+
+
+def _find_main(root):
+    """Return the element most likely to hold the page's main content."""
+    for xpath in ("//main", "//article", "//*[@role='main']"):
+        found = root.xpath(xpath)
+        if found:
+            return max(found, key=lambda element: len(element.text_content()))
+
+    # Credit paragraph text to its parent, and half of it to the grandparent
+    scores = {}
+    for paragraph in root.iter(*CONTENT_TAGS):
+        length = len(paragraph.text_content().strip())
+        parent = paragraph.getparent()
+        if length < MIN_PARAGRAPH_CHARS or parent is None:
+            continue
+        scores[parent] = scores.get(parent, 0) + length
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            scores[grandparent] = scores.get(grandparent, 0) + length / 2
+
+    if scores:
+        return max(scores, key=scores.get)
+    body = root.find("body")
+    return body if body is not None else root
+
+
+def _render_blocks(root):
+    """Walk the tree iteratively, emitting one markdown-lite string per block."""
+    blocks = []
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            text = _collapse(item)
+            if text:
+                blocks.append(text)
+            continue
+
+        tag = item.tag if isinstance(item.tag, str) else ""
+        if tag in LEAF_BLOCKS:
+            block = _render_leaf(item, tag)
+            if block:
+                blocks.append(block)
+            continue
+
+        # Container: its own text, then each child followed by the child's tail
+        sequence = [item.text or ""]
+        for child in item:
+            sequence.append(child)
+            sequence.append(child.tail or "")
+        stack.extend(reversed(sequence))
+    return blocks
+
+
+def _render_leaf(element, tag):
+    if tag == "pre":
+        code = element.text_content().strip("\n")
+        return f"```\n{code}\n```" if code.strip() else ""
+
+    text = _collapse(_inline(element))
+    if not text:
+        return ""
+    if tag[0] == "h" and tag[1:].isdigit():
+        return f"{'#' * int(tag[1:])} {text}"
+    if tag == "li":
+        return f"- {text}"
+    if tag == "blockquote":
+        return f"> {text}"
+    return text
+
+
+def _inline(element):
+    """Render the inline content of an element, keeping absolute links."""
+    parts = [element.text or ""]
+    for child in element:
+        tag = child.tag if isinstance(child.tag, str) else ""
+        if tag == "a" and child.get("href", "").startswith(("http://", "https://")):
+            label = _collapse(_inline(child))
+            parts.append(f"[{label}]({child.get('href')})" if label else "")
+        elif tag == "br":
+            parts.append("\n")
+        elif tag:
+            parts.append(f" {_inline(child)} " if tag in LEAF_BLOCKS else _inline(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _collapse(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+# Extraction backends selectable by name
+EXTRACTORS = {
+    "lxml": lxml_extract,
+    "markdownify": markdownify_extract,
+}
+
+
+def get_extractor(name: str):
+    """Return the extraction function registered under ``name``."""
+    try:
+        return EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"❌ Error: Unknown extractor '{name}'. Use one of {list(EXTRACTORS)}.")
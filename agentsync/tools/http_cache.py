@@ -0,0 +1,146 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+from typing import Optional
+
+# Default total size of cached page bodies before the least recently used are evicted
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Default seconds an entry is kept after it was last fetched or revalidated
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+# Eviction runs once per this many writes instead of on every write
+EVICT_EVERY = 100
+
+def parse_max_age(cache_control: str) -> Optional[float]:
+    """
+    Read the freshness lifetime from a Cache-Control header.
+
+    Returns:
+        Seconds the response may be reused without revalidation, 0 when it must
+        always be revalidated, or None when it must not be stored at all.
+        ``private`` responses are not stored, since the cache is shared by
+        every tool and process using the same file.
+    """
+    directives = cache_control.lower()
+    if "no-store" in directives or re.search(r"(?:^|[\s,])private(?:$|[\s,=])", directives):
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    match = re.search(r"max-age=(\d+)", directives)
+    return float(match.group(1)) if match else 0.0
+
+
+def varies_by_request(vary: str) -> bool:
+    """
+    Whether a Vary header makes the body depend on request headers the cache does not key on.
+
+    Only Accept-Encoding is harmless: requests decodes the body before it is stored.
+    """
+    fields = {field.strip().lower() for field in vary.split(",") if field.strip()}
+    return bool(fields - {"accept-encoding"})
+
+
+class HttpCache:
+    """
+    Sqlite-backed cache of fetched page bodies and their HTTP validators.
+
+    Entries still within their Cache-Control max-age are served without any
+    request; older ones are revalidated with If-None-Match / If-Modified-Since
+    so an unchanged page costs a bodiless 304. Entries not fetched or
+    revalidated for ``max_age`` seconds are purged; once the stored bodies
+    exceed ``max_bytes`` the least recently used are evicted.
+    """
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES, max_age: Optional[float] = DEFAULT_MAX_AGE):
+        """
+        Args:
+            path: Location of the sqlite file.
+            max_bytes: Total size of stored page bodies kept.
+            max_age: Seconds an entry is kept after its last fetch, or None to keep entries until evicted by size.
+        """
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, body TEXT, etag TEXT, last_modified TEXT, "
+                "fetched_at REAL, max_age REAL, size INTEGER, used_at REAL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+            if "size" not in columns:
+                # Caches written before eviction existed
+                self._conn.execute("ALTER TABLE pages ADD COLUMN size INTEGER")
+                self._conn.execute("ALTER TABLE pages ADD COLUMN used_at REAL")
+                self._conn.execute("UPDATE pages SET size = LENGTH(body), used_at = fetched_at")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS pages_used ON pages (used_at)")
+
+    def get(self, url):
+        """Return the cached entry for a URL as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, fetched_at, max_age FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is not None:
+                with self._conn:
+                    self._conn.execute("UPDATE pages SET used_at = ? WHERE url = ?", (time.time(), url))
+        if row is None:
+            return None
+        return {"body": row[0], "etag": row[1], "last_modified": row[2], "fetched_at": row[3], "max_age": row[4]}
+
+    @staticmethod
+    def is_fresh(entry):
+        return time.time() - entry["fetched_at"] < entry["max_age"]
+
+    def put(self, url, body, etag=None, last_modified=None, max_age=0.0):
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, fetched_at, max_age, size, used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, body, etag, last_modified, now, max_age, len(body), now)
+                )
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= EVICT_EVERY:
+                self._evict()
+
+    def touch(self, url, max_age=0.0):
+        """Mark an entry as freshly revalidated after a 304 response."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, max_age = ?, used_at = ? WHERE url = ?", (now, max_age, now, url)
+            )
+
+    def evict(self) -> int:
+        """Drop stale entries and trim the cache to ``max_bytes``; returns the number removed."""
+        with self._lock:
+            return self._evict()
+
+    def _evict(self):
+        self._writes_since_evict = 0
+        removed = 0
+        with self._conn:
+            if self.max_age is not None:
+                removed += self._conn.execute(
+                    "DELETE FROM pages WHERE fetched_at < ?", (time.time() - self.max_age,)
+                ).rowcount
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk from least to most recently used until enough bytes are freed
+                excess = total - self.max_bytes
+                cutoff = None
+                for used_at, size in self._conn.execute("SELECT used_at, size FROM pages ORDER BY used_at"):
+                    excess -= size or 0
+                    cutoff = used_at
+                    if excess <= 0:
+                        break
+                removed += self._conn.execute("DELETE FROM pages WHERE used_at <= ?", (cutoff,)).rowcount
+        self.evictions += removed
+        return removed
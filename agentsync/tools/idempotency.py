@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Callable, Optional
+import agentsync.config as settings
+
+# Marker distinguishing "no record" from a recorded None result
+_MISSING = object()
+
+
+def idempotency_key(*parts) -> str:
+    """
+    Derive a stable idempotency key from the parts identifying an effect.
+
+    Typically the run's thread id, the tool name and its arguments, so a
+    replayed step produces the same key as the original one.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _succeeded(result):
+    """Tools report failure as False or a {"success": False} dict; anything else counts as done."""
+    if result is False:
+        return False
+    return not (isinstance(result, dict) and result.get("success") is False)
+
+
+class IdempotencyStore:
+    """
+    Sqlite record of completed side effects, keyed by idempotency key.
+
+    A side-effecting call wrapped in ``run`` is executed only if no completed
+    effect is recorded under its key; otherwise the recorded result is
+    returned. Effects are recorded after they succeed, so a crash between the
+    effect and the record can still repeat it once, but replaying a run from
+    a checkpoint does not.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Location of the sqlite file; IDEMPOTENCY_FILE by default.
+        """
+        self.path = path or settings.IDEMPOTENCY_FILE
+        self._lock = threading.Lock()
+        # key -> [lock, number of callers holding or waiting for it]
+        self._key_locks = {}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS effects (key TEXT PRIMARY KEY, result TEXT, completed_at REAL)"
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the recorded result for a key, or ``default`` if the effect has not completed."""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM effects WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def record(self, key: str, result: Any = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO effects (key, result, completed_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result, default=str), time.time())
+            )
+
+    def forget(self, key: str):
+        """Remove a record so the effect can run again."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM effects WHERE key = ?", (key,))
+
+    def run(self, key: str, effect: Callable[[], Any],
+            succeeded: Callable[[Any], bool] = _succeeded) -> Any:
+        """
+        Run ``effect`` unless an effect with the same key already completed.
+
+        Args:
+            key: Idempotency key of the effect.
+            effect: Function performing the side effect.
+            succeeded: Decides from the result whether the effect completed and should be recorded.
+
+        Returns:
+            The effect's result, or the recorded result of the earlier run.
+        """
+        # Concurrent calls with the same key run one at a time, so only the first performs the effect
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                previous = self.get(key, _MISSING)
+                if previous is not _MISSING:
+                    print(f"⚠️ Skipping already completed operation (idempotency key {key})")
+                    return previous
+                result = effect()
+                if succeeded(result):
+                    self.record(key, result)
+                return result
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._key_locks[key]
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Return the process-wide idempotency store shared by the side-effecting tools."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = IdempotencyStore()
+        return _shared_store
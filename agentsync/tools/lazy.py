@@ -0,0 +1,46 @@
+import threading
+
+
+class LazyTool:
+    """
+    Proxy that constructs a tool on first use.
+
+    Tool constructors authenticate with Google or open caches, so building them
+    when an agent's tool table is assembled makes every worker pay for tools it
+    may never call. The proxy stores the factory and its arguments and builds
+    the real tool, once and thread-safely, the first time an attribute is read.
+    """
+
+    def __init__(self, factory, *args, **kwargs):
+        """
+        Args:
+            factory: Tool class or function returning the tool.
+            *args, **kwargs: Arguments passed to the factory.
+        """
+        self._factory = factory
+        self._args = args
+        self._kwargs = kwargs
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self):
+        """Whether the underlying tool has been constructed."""
+        return self._instance is not None
+
+    def resolve(self):
+        """Return the underlying tool, constructing it if needed."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory(*self._args, **self._kwargs)
+        return self._instance
+
+    def __getattr__(self, name):
+        # Only called for attributes not set in __init__, i.e. those of the tool
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        name = getattr(self._factory, "__name__", repr(self._factory))
+        state = "initialized" if self.initialized else "pending"
+        return f"<LazyTool {name} ({state})>"
@@ -0,0 +1,522 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import inspect
+import functools
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from cachetools import TTLCache
+from langchain_core.tools import BaseTool
+import agentsync.config as settings
+from agentsync.tools.email_verification_cache import normalize_email
+from agentsync.tools.search_cache import normalize_query
+
+# Default seconds a memoized tool result stays fresh in memory
+DEFAULT_TTL = 5 * 60
+# Default number of results kept in memory per tool
+DEFAULT_MAX_ENTRIES = 256
+# Key in BaseTool.metadata holding a tool's CachePolicy
+POLICY_METADATA_KEY = "cache_policy"
+# Arguments passed by LangChain rather than the model; never part of a cache key
+RUNTIME_ARGS = frozenset({"config", "run_manager", "callbacks"})
+
+
+class CachePolicy:
+    """
+    How the results of one read-only tool, or the writes of one write tool, are cached.
+
+    A read tool lists the ``resources`` its results depend on; a write tool
+    lists the resources it ``invalidates``, and every cached result of a tool
+    reading one of them is dropped after the write.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 disk_ttl: Optional[float] = None, resources: Iterable[str] = (),
+                 invalidates: Iterable[str] = (), normalize: Optional[Dict[str, Callable[[Any], Any]]] = None,
+                 ignore_args: Iterable[str] = (), scope: Optional[str] = None):
+        """
+        Args:
+            ttl: Seconds a result stays in the memory tier.
+            max_entries: Maximum number of results kept in memory for the tool.
+            disk_ttl: Seconds a result stays valid in the sqlite tier, or None for memory only.
+            resources: Names of the resources the tool reads, e.g. "calendar".
+            invalidates: Names of the resources the tool writes.
+            normalize: Argument name -> function normalizing its value before keying.
+            ignore_args: Arguments left out of the cache key.
+            scope: Owner of the results, e.g. the account or spreadsheet the tool is bound to.
+                Tools of the same name only share results within a scope; without one, only
+                tools wrapping the same function do.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk_ttl = disk_ttl
+        self.resources = frozenset(resources)
+        self.invalidates = frozenset(invalidates)
+        self.normalize = dict(normalize or {})
+        self.ignore_args = frozenset(ignore_args)
+        self.scope = scope
+
+    @property
+    def cacheable(self) -> bool:
+        return bool(self.ttl) or bool(self.disk_ttl)
+
+    def __repr__(self):
+        return (f"CachePolicy(ttl={self.ttl}, disk_ttl={self.disk_ttl}, resources={sorted(self.resources)}, "
+                f"invalidates={sorted(self.invalidates)})")
+
+
+def writes(*resources: str) -> CachePolicy:
+    """Policy of a write tool: nothing is cached, and the given resources are invalidated after each call."""
+    return CachePolicy(ttl=0, invalidates=resources)
+
+
+# num_results stays in the key: a formatted result list cannot be sliced to a smaller request
+_SEARCH = CachePolicy(ttl=15 * 60, disk_ttl=24 * 3600, resources=("web",), normalize={"query": normalize_query})
+_PAGE = CachePolicy(ttl=15 * 60, disk_ttl=6 * 3600, resources=("web",), normalize={"query": normalize_query})
+_EMAIL = CachePolicy(ttl=3600, disk_ttl=7 * 24 * 3600, resources=("email_verification",),
+                     normalize={"email": normalize_email})
+_CALENDAR = CachePolicy(ttl=60, resources=("calendar",))
+_SHEET = CachePolicy(ttl=60, resources=("sheet",))
+
+# Policies applied by tool name to LangChain tools that carry no policy of their own, e.g. a
+# ``@tool def read_sheet(...)`` wrapping GoogleSheetsTool. Write policies apply even to agents
+# that only memoize tools marked with ``cacheable``.
+DEFAULT_POLICIES = {
+    "search": _SEARCH,
+    "web_search": _SEARCH,
+    "google_search": _SEARCH,
+    "duckduckgo_search": _SEARCH,
+    "visit_webpage": _PAGE,
+    "visit_webpages": _PAGE,
+    "verify_email": _EMAIL,
+    "list_events": _CALENDAR,
+    "get_events": _CALENDAR,
+    "free_busy": _CALENDAR,
+    "check_availability": _CALENDAR,
+    "read_sheet": _SHEET,
+    "create_event": writes("calendar"),
+    "schedule_event": writes("calendar"),
+    "update_event": writes("calendar"),
+    "modify_event": writes("calendar"),
+    "delete_event": writes("calendar"),
+    "cancel_event": writes("calendar"),
+    "update_sheet": writes("sheet"),
+}
+
+
+def cacheable(tool: BaseTool, policy: Optional[CachePolicy] = None, **kwargs) -> BaseTool:
+    """
+    Mark a tool with a cache policy, read by ``ToolCache.wrap_tools`` and ``AgentCreator.create_agent``.
+
+    Args:
+        tool: The tool to mark; its metadata is updated in place.
+        policy: The policy to use; built from ``kwargs`` (see CachePolicy) when omitted.
+
+    Returns:
+        The same tool, for use as ``tools=[cacheable(search, ttl=600)]``.
+    """
+    tool.metadata = {**(tool.metadata or {}), POLICY_METADATA_KEY: policy or CachePolicy(**kwargs)}
+    return tool
+
+
+class ToolCache:
+    """
+    Two-tier memoization of read-only tool results with resource invalidation.
+
+    Results are keyed on the tool's namespace and its normalized model-facing
+    arguments; injected arguments such as the run config or graph state are
+    left out. The namespace is the tool name plus the policy's ``scope`` or,
+    without one, the wrapped function, so two tools of the same name bound to
+    different accounts never share results. Each namespace has its own
+    in-memory TTL cache sized by its policy; results of tools with a
+    ``disk_ttl`` and a namespace that is stable across processes (a scope or a
+    module-level function) are also kept in sqlite. Failed calls (exceptions, False, ``{"success": False}`` or
+    "❌" messages) are never cached. Concurrent identical calls wait for the
+    first one instead of issuing their own.
+    """
+
+    def __init__(self, path: Optional[str] = None, policies: Optional[Dict[str, CachePolicy]] = None):
+        """
+        Args:
+            path: Location of the sqlite tier; TOOL_CACHE_FILE by default.
+            policies: Tool name -> policy for tools without a policy in their metadata;
+                DEFAULT_POLICIES by default.
+        """
+        # Resolved on first disk access, so agents without disk-cached tools never load the settings
+        self.path = path
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        # Namespace -> memory tier of the tools in it
+        self._memory = {}
+        # Tool name -> its namespaces; identity-based ones are dropped with their function
+        self._namespaces = {}
+        # (name, namespace) of identity-based namespaces whose function was collected
+        self._forgotten = []
+        # Functions that cannot be weakly referenced, pinned so their id stays unique
+        self._pinned = {}
+        # Resource name -> names of the tools whose results depend on it
+        self._readers = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        _live_caches.add(self)
+
+    def policy_for(self, tool: BaseTool, marked_only: bool = False) -> Optional[CachePolicy]:
+        """
+        Return the tool's own policy, else the one registered for its name.
+
+        With ``marked_only``, policies by name are only used for write tools,
+        so they still invalidate the results of marked read tools.
+        """
+        if not isinstance(tool, BaseTool):
+            # Plain functions passed as tools carry no metadata
+            return None
+        policy = (tool.metadata or {}).get(POLICY_METADATA_KEY)
+        if policy is not None:
+            return policy
+        policy = self.policies.get(tool.name)
+        if marked_only and policy is not None and policy.cacheable:
+            return None
+        return policy
+
+    def wrap_tools(self, tools: List[BaseTool], marked_only: bool = False) -> List[BaseTool]:
+        """
+        Return the tools with every tool that has a policy replaced by a memoizing copy.
+
+        Args:
+            tools: Tools of an agent.
+            marked_only: Only memoize tools marked with ``cacheable``; write policies by name still apply.
+        """
+        wrapped = []
+        for tool in tools:
+            policy = self.policy_for(tool, marked_only)
+            wrapped.append(tool if policy is None else self.wrap(tool, policy))
+        return wrapped
+
+    def wrap(self, tool: BaseTool, policy: Optional[CachePolicy] = None) -> BaseTool:
+        """
+        Return a copy of ``tool`` that reads and invalidates this cache according to its policy.
+
+        Tools without a policy, and tools not built from a function (``@tool``,
+        ``StructuredTool.from_function``), are returned unchanged.
+        """
+        policy = policy or self.policy_for(tool)
+        if policy is None or not (policy.cacheable or policy.invalidates):
+            return tool
+        if getattr(tool, "func", None) is None and getattr(tool, "coroutine", None) is None:
+            print(f"⚠️ Warning: Tool {tool.name} is not function-based; running without memoization.")
+            return tool
+
+        namespace, persistent = _namespace(tool, policy)
+        with self._lock:
+            self._prune()
+            if policy.cacheable and namespace not in self._memory:
+                self._memory[namespace] = TTLCache(maxsize=policy.max_entries, ttl=policy.ttl or policy.disk_ttl)
+                self._namespaces.setdefault(tool.name, set()).add(namespace)
+                if not persistent:
+                    # The id in the namespace is only unique while the function lives
+                    owner = tool.func or tool.coroutine
+                    try:
+                        weakref.finalize(owner, self._forgotten.append, (tool.name, namespace))
+                    except TypeError:
+                        self._pinned[namespace] = owner
+            if policy.cacheable:
+                # A marked tool without resources of its own reads what its namesake policy declares
+                default = self.policies.get(tool.name)
+                for resource in policy.resources or (default.resources if default else ()):
+                    self._readers.setdefault(resource, set()).add(tool.name)
+        # Identity-based namespaces mean nothing to another process; keep them in memory only
+        disk_ttl = policy.disk_ttl if persistent else None
+        arg_names = _model_args(tool)
+        defaults = _defaults(tool.func or tool.coroutine)
+        as_tuple = getattr(tool, "response_format", "content") == "content_and_artifact"
+        update = {}
+
+        if tool.func is not None:
+            func = tool.func
+
+            @functools.wraps(func)
+            def memoized(*args, **kwargs):
+                if not policy.cacheable:
+                    try:
+                        return func(*args, **kwargs)
+                    finally:
+                        invalidate(*policy.invalidates)
+                key = self._key(namespace, policy, arg_names, args, {**defaults, **kwargs})
+                return self._get_or_call(tool.name, namespace, disk_ttl, key, as_tuple, lambda: func(*args, **kwargs))
+
+            update["func"] = memoized
+
+        if getattr(tool, "coroutine", None) is not None:
+            coroutine = tool.coroutine
+
+            @functools.wraps(coroutine)
+            async def amemoized(*args, **kwargs):
+                if not policy.cacheable:
+                    try:
+                        return await coroutine(*args, **kwargs)
+                    finally:
+                        invalidate(*policy.invalidates)
+                # The async path skips request coalescing; identical calls within one step are rare
+                key = self._key(namespace, policy, arg_names, args, {**defaults, **kwargs})
+                found, value = self._lookup(namespace, disk_ttl, key, as_tuple)
+                if found:
+                    return value
+                with self._lock:
+                    self.misses += 1
+                result = await coroutine(*args, **kwargs)
+                self._store(tool.name, namespace, disk_ttl, key, result)
+                return result
+
+            update["coroutine"] = amemoized
+
+        return tool.model_copy(update=update)
+
+    def invalidate(self, *resources: str) -> int:
+        """
+        Drop every cached result of the tools reading any of ``resources``.
+
+        The sqlite tier is cleared for all processes; other processes keep
+        their memory tier until it expires.
+
+        Returns:
+            The number of tools whose results were dropped.
+        """
+        with self._lock:
+            # Readers known by name may have results on disk from another process
+            names = {name for name, policy in self.policies.items() if policy.resources & set(resources)}
+            for resource in resources:
+                names |= self._readers.get(resource, set())
+            for name in names:
+                for namespace in self._namespaces.get(name, ()):
+                    self._memory[namespace].clear()
+            conn = self._connection(create=False)
+            if conn is not None and names:
+                with conn:
+                    conn.executemany("DELETE FROM tool_cache WHERE tool = ?", [(name,) for name in names])
+            self.invalidations += 1
+            return len(names)
+
+    def clear(self):
+        """Drop every cached result from both tiers."""
+        with self._lock:
+            for memory in self._memory.values():
+                memory.clear()
+            conn = self._connection(create=False)
+            if conn is not None:
+                with conn:
+                    conn.execute("DELETE FROM tool_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._prune()
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "entries": sum(len(memory) for memory in self._memory.values()),
+            }
+
+    def _prune(self):
+        """Drop the namespaces of collected functions; called with the lock held."""
+        # Finalizers only append, since they may run while the lock is held
+        while self._forgotten:
+            name, namespace = self._forgotten.pop()
+            self._memory.pop(namespace, None)
+            namespaces = self._namespaces.get(name)
+            if namespaces is not None:
+                namespaces.discard(namespace)
+                if not namespaces:
+                    del self._namespaces[name]
+
+    def _get_or_call(self, name, namespace, disk_ttl, key, as_tuple, call):
+        while True:
+            found, value = self._lookup(namespace, disk_ttl, key, as_tuple)
+            if found:
+                return value
+            with self._lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+            if not leader:
+                try:
+                    return future.result()
+                except Exception:
+                    # The first call failed; try again rather than sharing its error
+                    continue
+
+            try:
+                result = call()
+                self._store(name, namespace, disk_ttl, key, result)
+                future.set_result(result)
+                return result
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+    def _lookup(self, namespace, disk_ttl, key, as_tuple):
+        with self._lock:
+            memory = self._memory[namespace]
+            if key in memory:
+                self.hits += 1
+                return True, memory[key]
+            conn = self._connection(create=False) if disk_ttl else None
+            row = None
+            if conn is not None:
+                row = conn.execute("SELECT result, stored_at FROM tool_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or time.time() - row[1] >= disk_ttl:
+                return False, None
+            value = json.loads(row[0])
+            if as_tuple and isinstance(value, list):
+                value = tuple(value)
+            memory[key] = value
+            self.hits += 1
+            return True, value
+
+    def _store(self, name, namespace, disk_ttl, key, result):
+        if not _succeeded(result):
+            return
+        with self._lock:
+            self._memory[namespace][key] = result
+            if not disk_ttl:
+                return
+            try:
+                payload = json.dumps(result)
+            except (TypeError, ValueError):
+                # Not JSON-serializable; kept in memory only
+                return
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tool_cache (key, tool, namespace, result, stored_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, name, namespace, payload, time.time())
+                )
+
+    def _connection(self, create=True):
+        """Open the sqlite tier on first use, so memory-only tools never touch the disk."""
+        if self._conn is None:
+            self.path = self.path or settings.TOOL_CACHE_FILE
+            if not (create or os.path.exists(self.path)):
+                return None
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS tool_cache ("
+                    "key TEXT PRIMARY KEY, tool TEXT, namespace TEXT, result TEXT, stored_at REAL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS tool_cache_tool ON tool_cache (tool)")
+        return self._conn
+
+    @staticmethod
+    def _key(namespace, policy, arg_names, args, kwargs):
+        arguments = {}
+        for arg, value in kwargs.items():
+            if arg in RUNTIME_ARGS or arg in policy.ignore_args or (arg_names and arg not in arg_names):
+                continue
+            if value is None:
+                # An omitted optional argument and an explicit None mean the same call
+                continue
+            normalize = policy.normalize.get(arg)
+            arguments[arg] = normalize(value) if normalize else _normalize_value(value)
+        payload = json.dumps([namespace, [_normalize_value(arg) for arg in args], arguments], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _namespace(tool, policy):
+    """
+    Return ``(namespace, persistent)`` separating the results of tools that share a name.
+
+    A scope or a module-level function names the same thing in every process;
+    closures and bound methods (e.g. a tool built around one user's client)
+    are only told apart by identity, which is meaningless elsewhere.
+    """
+    if policy.scope is not None:
+        return f"{tool.name}@{policy.scope}", True
+    func = inspect.unwrap(tool.func or tool.coroutine)
+    qualname = f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', type(func).__qualname__)}"
+    if inspect.isfunction(func) and not func.__closure__ and "<locals>" not in qualname and "<lambda>" not in qualname:
+        return f"{tool.name}@{qualname}", True
+    return f"{tool.name}@{qualname}#{id(tool.func or tool.coroutine)}", False
+
+
+def _model_args(tool):
+    """Names of the arguments the model fills in, excluding injected state and config."""
+    try:
+        return frozenset(tool.tool_call_schema.model_fields)
+    except AttributeError:
+        return frozenset(tool.args)
+
+
+def _defaults(func):
+    """Default argument values, so omitting an argument and passing its default share a key."""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return {}
+    return {parameter.name: parameter.default for parameter in parameters
+            if parameter.default is not inspect.Parameter.empty and parameter.name not in RUNTIME_ARGS}
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items()}
+    return value
+
+
+def _succeeded(result):
+    """Tools report failure as None, False, a {"success": False} dict or a "❌" message."""
+    if result is None or result is False:
+        return False
+    if isinstance(result, str) and result.lstrip().startswith("❌"):
+        return False
+    return not (isinstance(result, dict) and result.get("success") is False)
+
+
+# Every ToolCache in the process, so writes made outside an agent reach all of them
+_live_caches = weakref.WeakSet()
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolCache:
+    """Return the process-wide tool cache used by AgentCreator for tools marked as cacheable."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ToolCache()
+        return _shared_cache
+
+
+def invalidate(*resources: str):
+    """
+    Drop cached results depending on ``resources`` from every tool cache of the process.
+
+    Called by the Calendar and Sheets tools after each successful write, so
+    direct writes that do not go through a wrapped write tool are seen too.
+    """
+    caches = set(_live_caches)
+    caches.add(get_tool_cache())
+    for cache in caches:
+        cache.invalidate(*resources)
@@ -0,0 +1,147 @@
+import re
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable, List, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Default number of tokens of page content returned for a query
+DEFAULT_TOKEN_BUDGET = 2000
+# Target passage size; paragraphs are merged or split to approach it
+PASSAGE_CHARS = 800
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Marker placed between non-adjacent passages in the output
+PASSAGE_SEPARATOR = "\n\n[...]\n\n"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken's cl100k_base encoding, or estimate when it is unavailable."""
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # No tokenizer files offline; ~4 characters per token is close enough for budgeting
+                _encoding = False
+    if _encoding is False:
+        return len(text) // 4 + 1
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def split_passages(text: str, max_chars: int = PASSAGE_CHARS) -> List[str]:
+    """
+    Split text into passages of roughly ``max_chars`` characters.
+
+    Paragraphs (blank-line separated) are kept whole and merged with their
+    neighbours while they fit; oversized paragraphs are split on sentence
+    boundaries, and as a last resort at ``max_chars``.
+    """
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in SENTENCE_PATTERN.split(paragraph):
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+
+    passages = []
+    for piece in pieces:
+        if passages and len(passages[-1]) + len(piece) + 2 <= max_chars:
+            passages[-1] = f"{passages[-1]}\n\n{piece}"
+        else:
+            passages.append(piece)
+    return passages
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def bm25_scores(query: str, documents: Sequence[str]) -> "np.ndarray":
+    """Score every document against the query with BM25, vectorized over documents and terms."""
+    # numpy is imported on first use so loading the search tools stays cheap
+    import numpy as np
+
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not documents or not terms:
+        return np.zeros(len(documents))
+
+    term_index = {term: j for j, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)))
+    lengths = np.empty(len(documents))
+    for i, document in enumerate(documents):
+        tokens = tokenize(document)
+        lengths[i] = len(tokens)
+        for term, count in Counter(tokens).items():
+            j = term_index.get(term)
+            if j is not None:
+                tf[i, j] = count
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((len(documents) - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(lengths.mean(), 1.0))
+    return (idf * tf * (BM25_K1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+
+def select_passages(text: str, query: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """
+    Return the passages of ``text`` most relevant to ``query`` within a token budget.
+
+    Matching passages are taken in order of BM25 score while they fit the
+    budget, then re-joined in document order.
+    """
+    import numpy as np
+
+    passages = split_passages(text)
+    if not passages:
+        return ""
+
+    scores = bm25_scores(query, passages)
+    # Passages sharing no term with the query are only used when nothing matches
+    candidates = np.argsort(-scores, kind="stable")
+    if scores.max() > 0:
+        candidates = candidates[scores[candidates] > 0]
+
+    chosen = []
+    used = 0
+    for i in candidates:
+        cost = count_tokens(passages[i])
+        if used + cost <= token_budget:
+            chosen.append(i)
+            used += cost
+    if not chosen:
+        # Even the best passage exceeds the budget; return its approximate head
+        return passages[candidates[0]][:token_budget * 4]
+
+    parts = []
+    previous = None
+    for i in sorted(chosen):
+        if previous is not None:
+            parts.append("\n\n" if i == previous + 1 else PASSAGE_SEPARATOR)
+        parts.append(passages[i])
+        previous = i
+    return "".join(parts)
+
+
+def rank_results(query: str, results: List[dict], fields: Iterable[str] = ("title", "snippet")) -> List[dict]:
+    """Reorder search result dicts by BM25 relevance of their text fields to the query."""
+    import numpy as np
+
+    fields = tuple(fields)
+    documents = [" ".join(str(res.get(field) or "") for field in fields) for res in results]
+    scores = bm25_scores(query, documents)
+    return [results[i] for i in np.argsort(-scores, kind="stable")]
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+from cachetools import TTLCache
+import agentsync.config as settings
+
+# Seconds a search result stays fresh in memory and on disk
+DEFAULT_MEMORY_TTL = 15 * 60
+DEFAULT_DISK_TTL = 24 * 3600
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+class SearchCache:
+    """
+    Two-tier cache of raw search results with single-flight request coalescing.
+
+    Entries are keyed on (engine, normalized query) and hold the engine's raw
+    result dicts, so a request for fewer results than were fetched is served
+    from the same entry. The memory tier is an LRU with TTL; an optional sqlite
+    tier keeps results across processes. Concurrent misses for the same key
+    wait for the first caller's request instead of issuing their own.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = DEFAULT_MEMORY_TTL,
+                 path: Optional[str] = None, disk_ttl: float = DEFAULT_DISK_TTL):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in memory.
+            ttl: Seconds an entry stays in the memory tier.
+            path: Location of the optional sqlite tier.
+            disk_ttl: Seconds an entry stays valid in the sqlite tier.
+        """
+        self.disk_ttl = disk_ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._memory = TTLCache(maxsize=max_entries, ttl=ttl)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS searches ("
+                    "key TEXT PRIMARY KEY, results TEXT, complete INTEGER, fetched_at REAL)"
+                )
+
+    def get_or_fetch(self, engine: str, query: str, num_results: int,
+                     fetch: Callable[[int], List[dict]]) -> List[dict]:
+        """
+        Return up to ``num_results`` raw results, calling ``fetch`` only on a miss.
+
+        Args:
+            engine: Name of the search engine the results come from.
+            query: The search query as typed.
+            num_results: Number of results the caller needs.
+            fetch: Function fetching at least that many raw results from the engine.
+        """
+        key = f"{engine}\x1f{normalize_query(query)}"
+        while True:
+            with self._lock:
+                entry = self._memory.get(key) or self._load(key)
+                if _satisfies(entry, num_results):
+                    self._memory[key] = entry
+                    self.hits += 1
+                    return entry["results"][:num_results]
+
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+
+            if not leader:
+                entry = future.result()
+                if _satisfies(entry, num_results):
+                    return entry["results"][:num_results]
+                # The in-flight request asked for fewer results; fetch again
+                continue
+
+            try:
+                results = fetch(num_results)
+                entry = {"results": results, "complete": len(results) < num_results}
+                with self._lock:
+                    self._memory[key] = entry
+                    self._store(key, entry)
+                future.set_result(entry)
+                return results[:num_results]
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            }
+
+    def _load(self, key):
+        if self._conn is None:
+            return None
+        row = self._conn.execute(
+            "SELECT results, complete, fetched_at FROM searches WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[2] >= self.disk_ttl:
+            return None
+        return {"results": json.loads(row[0]), "complete": bool(row[1])}
+
+    def _store(self, key, entry):
+        if self._conn is None:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (key, results, complete, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry["results"]), int(entry["complete"]), time.time())
+            )
+
+
+def _satisfies(entry, num_results):
+    """An entry can serve a request if it holds enough results or the engine had no more."""
+    return entry is not None and (len(entry["results"]) >= num_results or entry["complete"])
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache shared by all search tools."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchCache(path=settings.SEARCH_CACHE_FILE or None)
+        return _shared_cache
@@ -1,10 +1,40 @@
+import time
+import asyncio
+import threading
 import requests
-import re
-from typing import Optional
-from duckduckgo_search import DDGS
-from markdownify import markdownify
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 import agentsync.config as settings
+from agentsync.tools.html_extract import get_extractor
+from agentsync.tools.http_cache import HttpCache, parse_max_age, varies_by_request
+from agentsync.tools.passage_ranker import DEFAULT_TOKEN_BUDGET, rank_results, select_passages
+from agentsync.tools.search_cache import SearchCache, get_search_cache
+
+# Bytes of HTML read per page; markdown is truncated to 10,000 characters anyway
+DEFAULT_MAX_PAGE_BYTES = 512 * 1024
+
+# Results requested per SerpApi call, so later requests for fewer hit the cache
+SERPAPI_PAGE_SIZE = 10
+
+# Query parameters dropped when comparing result URLs
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "ref_src", "yclid"}
+# Weight of the newest latency sample in each engine's moving average
+LATENCY_EWMA_ALPHA = 0.3
+
+# Worker threads shared by multi-engine searches; late engines finish here after a deadline
+_search_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="web_search")
+
+# Worker threads running page visits for VisitWebpagesTool
+_visit_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="visit_webpage")
+
+# Keep-alive session shared by every search and page visit
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
 class GoogleSearchTool:
     name = "web_search"
@@ -15,9 +45,12 @@ class GoogleSearchTool:
     }
     output_type = "string"
 
-    def __init__(self, max_results: int = 5):
+    def __init__(self, max_results: int = 5, use_cache: bool = True, cache: Optional[SearchCache] = None,
+                 rerank: bool = False):
         self.api_key = settings.SERPAPI_KEY
         self.max_results = max_results
+        self.rerank = rerank
+        self.cache = cache or (get_search_cache() if use_cache else None)
         if not self.api_key:
             raise ValueError("❌ Error: SERPAPI API key is required.")
 
@@ -35,7 +68,13 @@ class GoogleSearchTool:
         if not query:
             raise ValueError("❌ Error: Search query is required.")
 
-        search_results = self._search_serpapi(query, num_results or self.max_results)
+        num_results = num_results or self.max_results
+        if self.rerank:
+            # Rank a full page of cached results against the query before truncating
+            search_results = rank_results(query, self.search_raw(query, max(num_results, SERPAPI_PAGE_SIZE)))
+        else:
+            search_results = self.search_raw(query, num_results)
+        search_results = search_results[:num_results]
 
         if not search_results:
             return f"No results found for '{query}'. Try a more general query."
@@ -43,6 +82,15 @@ class GoogleSearchTool:
         formatted_results = [f"**{i+1}. [{res['title']}]({res['link']})**\n{res['snippet']}" for i, res in enumerate(search_results)]
         return "## Search Results\n\n" + "\n\n".join(formatted_results)
 
+    def search_raw(self, query: str, num_results: int):
+        """Return raw result dicts (title, link, snippet), served from the shared cache when possible."""
+        if self.cache is None:
+            return self._search_serpapi(query, num_results)
+        return self.cache.get_or_fetch(
+            "serpapi", query, num_results,
+            lambda n: self._search_serpapi(query, max(n, SERPAPI_PAGE_SIZE))
+        )
+
     def _search_serpapi(self, query: str, num_results: int):
         """Helper function to fetch search results from SerpApi."""
         params = {
@@ -50,8 +98,9 @@ class GoogleSearchTool:
             "api_key": self.api_key,
             "engine": "google",
             "google_domain": "google.com",
+            "num": num_results,
         }
-        response = requests.get("https://serpapi.com/search.json", params=params)
+        response = _session.get("https://serpapi.com/search.json", params=params, timeout=20)
 
         if response.status_code != 200:
             raise Exception(f"Error fetching search results: {response.text}")
@@ -62,33 +111,240 @@ class GoogleSearchTool:
 class DuckDuckGoSearchTool:
     name = "web_search"
     description = """Performs a DuckDuckGo web search based on your query and returns the top search results."""
-    inputs = {"query": {"type": "string", "description": "The search query to perform."}}
+    inputs = {
+        "query": {"type": "string", "description": "The search query to perform."},
+        "num_results": {"type": "integer", "description": "Number of results to return", "nullable": True},
+    }
     output_type = "string"
 
-    def __init__(self, max_results=10):
+    def __init__(self, max_results=10, use_cache: bool = True, cache: Optional[SearchCache] = None,
+                 rerank: bool = False):
         self.max_results = max_results
-        self.ddgs = DDGS()
+        self.rerank = rerank
+        self.cache = cache or (get_search_cache() if use_cache else None)
+        self._ddgs = None
+
+    @property
+    def ddgs(self):
+        # duckduckgo_search is only imported once a search actually runs
+        if self._ddgs is None:
+            from duckduckgo_search import DDGS
+            self._ddgs = DDGS()
+        return self._ddgs
 
-    def search(self, query: str) -> str:
-        results = self.ddgs.text(query, max_results=self.max_results)
+    def search(self, query: str, num_results: Optional[int] = None) -> str:
+        num_results = num_results or self.max_results
+        if self.rerank:
+            results = rank_results(query, self.search_raw(query, max(num_results, self.max_results)), ("title", "body"))
+        else:
+            results = self.search_raw(query, num_results)
+        results = results[:num_results]
         if not results:
             return "No results found! Try a less restrictive/shorter query."
         formatted_results = [f"**{i+1}. [{res['title']}]({res['href']})**\n{res['body']}" for i, res in enumerate(results)]
         return "## Search Results\n\n" + "\n\n".join(formatted_results)
 
+    def search_raw(self, query: str, num_results: int):
+        """Return raw result dicts (title, href, body), served from the shared cache when possible."""
+        if self.cache is None:
+            return self.ddgs.text(query, max_results=num_results) or []
+        return self.cache.get_or_fetch(
+            "duckduckgo", query, num_results,
+            lambda n: self.ddgs.text(query, max_results=max(n, self.max_results)) or []
+        )
+
+
+class MultiSearchTool:
+    name = "web_search"
+    description = """Searches Google and DuckDuckGo at the same time and returns the merged, de-duplicated top results."""
+    inputs = {
+        "query": {"type": "string", "description": "The search query to perform."},
+        "num_results": {"type": "integer", "description": "Number of results to return", "nullable": True},
+    }
+    output_type = "string"
+
+    def __init__(self, engines: Optional[Dict[str, object]] = None, max_results: int = 5,
+                 deadline: float = 5.0, hedge_delay: float = 0.0, rerank: bool = False):
+        """
+        Args:
+            engines: Mapping of engine name to a tool exposing ``search_raw``. Defaults to
+                DuckDuckGo, plus SerpApi when SERPAPI_KEY is configured.
+            max_results: Default number of merged results.
+            deadline: Seconds to wait before returning whatever results have arrived.
+            hedge_delay: Head start in seconds given to the historically fastest engine;
+                the others are only queried if it has not returned enough results by then.
+                0 queries every engine at once.
+            rerank: Reorder merged results by BM25 relevance of their title and snippet.
+        """
+        if engines is None:
+            engines = {"duckduckgo": DuckDuckGoSearchTool()}
+            if settings.SERPAPI_KEY:
+                engines["serpapi"] = GoogleSearchTool()
+        self.engines = engines
+        self.max_results = max_results
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.rerank = rerank
+        self._stats = {name: {"calls": 0, "hits": 0, "errors": 0, "timeouts": 0, "latency": None} for name in engines}
+        self._stats_lock = threading.Lock()
+
+    def search(self, query: str, num_results: Optional[int] = None) -> str:
+        if not query:
+            raise ValueError("❌ Error: Search query is required.")
+
+        results = self.search_raw(query, num_results or self.max_results)
+        if self.rerank:
+            results = rank_results(query, results)
+        if not results:
+            return f"No results found for '{query}'. Try a more general query."
+
+        formatted_results = [f"**{i+1}. [{res['title']}]({res['link']})**\n{res['snippet']}" for i, res in enumerate(results)]
+        return "## Search Results\n\n" + "\n\n".join(formatted_results)
+
+    def search_raw(self, query: str, num_results: int) -> List[dict]:
+        """
+        Query the engines under the deadline and merge their results.
+
+        Returns:
+            Result dicts with ``title``, ``link``, ``snippet`` and the ``engines`` that returned them.
+        """
+        order = self._engine_order()
+        started = time.monotonic()
+        pending = {_search_executor.submit(self._run_engine, order[0], query, num_results): order[0]}
+        results = {}
+
+        if len(order) > 1:
+            done = self._collect(pending, results, timeout=min(self.hedge_delay, self.deadline))
+            if len(results.get(order[0], [])) < num_results or not done:
+                for name in order[1:]:
+                    pending[_search_executor.submit(self._run_engine, name, query, num_results)] = name
+
+        remaining = self.deadline - (time.monotonic() - started)
+        self._collect(pending, results, timeout=max(0.0, remaining))
+
+        # Engines still running have missed the deadline; their results still land in the search cache
+        with self._stats_lock:
+            for name in pending.values():
+                self._stats[name]["timeouts"] += 1
+
+        return _merge_results([results[name] for name in order if name in results], num_results)
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Return per-engine call, hit, error and timeout counts plus the latency moving average."""
+        with self._stats_lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def _engine_order(self) -> List[str]:
+        """
+        Fastest engines first, engines failing more often than they answer last.
+        Engines without a latency sample sort first so they get one.
+        """
+        with self._stats_lock:
+            return sorted(self.engines, key=lambda name: (
+                self._stats[name]["errors"] > self._stats[name]["hits"],
+                self._stats[name]["latency"] or 0.0,
+            ))
+
+    def _collect(self, pending, results, timeout):
+        """Wait for pending engine futures, moving finished ones into ``results``."""
+        done, _ = wait(list(pending), timeout=timeout)
+        for future in done:
+            name = pending.pop(future)
+            if future.exception() is None:
+                results[name] = future.result()
+        return bool(done)
+
+    def _run_engine(self, name: str, query: str, num_results: int) -> List[dict]:
+        started = time.monotonic()
+        try:
+            raw = self.engines[name].search_raw(query, num_results)
+        except Exception:
+            with self._stats_lock:
+                self._stats[name]["calls"] += 1
+                self._stats[name]["errors"] += 1
+            raise
+        elapsed = time.monotonic() - started
+
+        with self._stats_lock:
+            stats = self._stats[name]
+            stats["calls"] += 1
+            stats["hits"] += bool(raw)
+            previous = stats["latency"]
+            stats["latency"] = elapsed if previous is None else (
+                LATENCY_EWMA_ALPHA * elapsed + (1 - LATENCY_EWMA_ALPHA) * previous
+            )
+        return [_normalize_result(res, name) for res in raw]
+
+
+def canonical_url(url: str) -> str:
+    """Reduce a URL to a comparison key: no scheme, www., fragment, trailing slash or tracking parameters."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+
+def _normalize_result(res: dict, engine: str) -> dict:
+    """Map SerpApi and DuckDuckGo result dicts onto title / link / snippet."""
+    return {
+        "title": res.get("title") or "",
+        "link": res.get("link") or res.get("href") or "",
+        "snippet": res.get("snippet") or res.get("body") or "",
+        "engines": [engine],
+    }
+
+
+def _merge_results(result_lists: List[List[dict]], num_results: int) -> List[dict]:
+    """Interleave ranked lists (preferred engine first) and drop duplicate URLs."""
+    merged = {}
+    for rank in range(max((len(results) for results in result_lists), default=0)):
+        for results in result_lists:
+            if rank >= len(results) or not results[rank]["link"]:
+                continue
+            res = results[rank]
+            key = canonical_url(res["link"])
+            if key in merged:
+                merged[key]["engines"] += res["engines"]
+            else:
+                merged[key] = dict(res)
+    return list(merged.values())[:num_results]
+
 
 class VisitWebpageTool:
     name = "visit_webpage"
     description = """Visits a webpage and reads its content as a markdown string."""
-    inputs = {"url": {"type": "string", "description": "The URL of the webpage to visit."}}
+    inputs = {
+        "url": {"type": "string", "description": "The URL of the webpage to visit."},
+        "query": {"type": "string", "description": "What to look for; only the most relevant passages are returned.", "nullable": True},
+    }
     output_type = "string"
 
-    def search(self, url: str) -> str:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_PAGE_BYTES, use_cache: bool = True,
+                 cache_path: Optional[str] = None, extractor: str = "lxml"):
+        """
+        Args:
+            max_bytes: Stop reading a response body after this many bytes.
+            use_cache: Whether to keep fetched pages in the on-disk HTTP cache.
+            cache_path: Location of the cache, defaults to HTTP_CACHE_FILE.
+            extractor: HTML-to-text backend, "lxml" (fast, main content only) or "markdownify".
+        """
+        self.max_bytes = max_bytes
+        self.extract = get_extractor(extractor)
+        self.cache = HttpCache(cache_path or settings.HTTP_CACHE_FILE) if use_cache else None
+
+    def search(self, url: str, query: Optional[str] = None, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
         try:
-            response = requests.get(url, timeout=20)
-            response.raise_for_status()
-            markdown_content = markdownify(response.text).strip()
-            markdown_content = re.sub(r"\n{3,}", "\n\n", markdown_content)
+            html = self._fetch(url)
+            markdown_content = self.extract(html)
+            if query:
+                # Keep the passages most relevant to the query instead of the page head
+                return select_passages(markdown_content, query, token_budget)
             return markdown_content[:10000]  # Truncate long content
         except requests.exceptions.Timeout:
             return "The request timed out. Please try again later or check the URL."
@@ -96,3 +352,122 @@ class VisitWebpageTool:
             return f"Error fetching the webpage: {str(e)}"
         except Exception as e:
             return f"An unexpected error occurred: {str(e)}"
+
+    def _fetch(self, url: str) -> str:
+        """
+        Fetch a page body through the shared session and the HTTP cache.
+
+        Fresh cache entries are returned without a request, stale ones are
+        revalidated with a conditional GET, and new bodies are streamed only up
+        to ``max_bytes``. Only complete bodies are cached, so a tool with a
+        larger cap never gets a page truncated by another one.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and HttpCache.is_fresh(cached):
+            return cached["body"][:self.max_bytes]
+
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        with _session.get(url, headers=headers, timeout=20, stream=True) as response:
+            max_age = parse_max_age(response.headers.get("Cache-Control", ""))
+            if response.status_code == 304 and cached:
+                self.cache.touch(url, max_age or 0.0)
+                return cached["body"][:self.max_bytes]
+            response.raise_for_status()
+            body, truncated = _read_capped(response, self.max_bytes)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        storable = (max_age is not None and not truncated
+                    and not varies_by_request(response.headers.get("Vary", "")))
+        if self.cache and storable and (etag or last_modified or max_age > 0):
+            self.cache.put(url, body, etag=etag, last_modified=last_modified, max_age=max_age)
+        return body
+
+
+def _read_capped(response, max_bytes: int) -> Tuple[str, bool]:
+    """Read a streamed response until ``max_bytes`` have arrived; returns the decoded body and whether it was cut."""
+    chunks = []
+    received = 0
+    truncated = False
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        chunks.append(chunk)
+        received += len(chunk)
+        if received > max_bytes:
+            truncated = True
+            break
+    return b"".join(chunks)[:max_bytes].decode(response.encoding or "utf-8", errors="replace"), truncated
+
+
+class VisitWebpagesTool:
+    name = "visit_webpages"
+    description = """Visits several webpages at once and reads their content as markdown strings."""
+    inputs = {
+        "urls": {"type": "array", "items": {"type": "string"}, "description": "The URLs of the webpages to visit."},
+        "query": {"type": "string", "description": "What to look for; only the most relevant passages are returned.", "nullable": True},
+    }
+    output_type = "string"
+
+    def __init__(self, visitor: Optional[VisitWebpageTool] = None, max_concurrency: int = 8,
+                 per_host_limit: int = 2, deadline: float = 30.0, token_budget: int = 2 * DEFAULT_TOKEN_BUDGET):
+        """
+        Args:
+            visitor: VisitWebpageTool used for each page, sharing its session, cache and extractor.
+            max_concurrency: Maximum number of pages fetched at once.
+            per_host_limit: Maximum number of concurrent fetches per host.
+            deadline: Seconds after which unfinished pages are reported as timed out.
+            token_budget: Total tokens of passages returned across all pages when a query is given.
+        """
+        self.visitor = visitor or VisitWebpageTool()
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.deadline = deadline
+        self.token_budget = token_budget
+
+    def search(self, urls: List[str], query: Optional[str] = None) -> str:
+        pages = self.fetch_all(urls, query)
+        if not pages:
+            return "No URLs were provided."
+        return "\n\n".join(f"## Page: {url}\n\n{content}" for url, content in pages.items())
+
+    def fetch_all(self, urls: List[str], query: Optional[str] = None) -> Dict[str, str]:
+        """Blocking wrapper around ``afetch_all``; use the coroutine when a loop is already running."""
+        return asyncio.run(self.afetch_all(urls, query))
+
+    async def afetch_all(self, urls: List[str], query: Optional[str] = None) -> Dict[str, str]:
+        """
+        Fetch pages concurrently under global and per-host limits and an overall deadline.
+
+        Returns:
+            Mapping of each distinct URL, in input order, to its content or an error message.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        page_budget = self.token_budget // max(len(urls), 1)
+        loop = asyncio.get_running_loop()
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host_limit))
+
+        async def visit(url):
+            # Wait for the host first, so URLs queued on a busy host do not hold global slots
+            async with host_limits[urlsplit(url).hostname], global_limit:
+                return await loop.run_in_executor(_visit_executor, self.visitor.search, url, query, page_budget)
+
+        tasks = {url: asyncio.ensure_future(visit(url)) for url in urls}
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+
+        pages = {}
+        for url, task in tasks.items():
+            if task.cancelled() or not task.done():
+                pages[url] = f"The page did not load within the {self.deadline:g}s deadline."
+            elif task.exception() is not None:
+                pages[url] = f"An unexpected error occurred: {task.exception()}"
+            else:
+                pages[url] = task.result()
+        return pages
@@ -0,0 +1,66 @@
+"""
+Compare bytes downloaded per Gmail message for each GmailTool read mode.
+
+"wire" is the response body as sent over the network (gzip-compressed, as
+the Google API client requests it); "decoded" is its size after
+decompression. Savings should be judged on the wire column.
+
+Runs against the authenticated Gmail account configured in .env, so it only
+reads messages and never marks them as read.
+
+Usage:
+    python -m benchmarks.gmail_read_bytes --query "in:inbox" --limit 50
+"""
+import gzip
+import json
+import argparse
+from google.auth.transport.requests import AuthorizedSession
+from agentsync.tools.gmail_tool import GmailTool, GMAIL_READ_MODES, _parse_message
+
+
+def fetch_raw(session, service, msg_id, params):
+    """Execute a messages().get request; returns (wire bytes, decoded bytes, message resource)."""
+    request = service.users().messages().get(userId="me", id=msg_id, **params)
+    headers = {**request.headers, "Accept-Encoding": "gzip"}
+    with session.request(request.method, request.uri, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        # Read the body undecoded to count what actually crossed the network
+        wire = response.raw.read(decode_content=False)
+        encoding = response.headers.get("Content-Encoding")
+    content = gzip.decompress(wire) if encoding == "gzip" else wire
+    return len(wire), len(content), json.loads(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--query", default="in:inbox", help="Gmail search query selecting the sample")
+    parser.add_argument("--limit", type=int, default=50, help="Number of messages to sample")
+    args = parser.parse_args()
+
+    gmail = GmailTool()
+    listing = gmail.service.users().messages().list(userId="me", q=args.query, maxResults=args.limit).execute()
+    msg_ids = [msg["id"] for msg in listing.get("messages", [])]
+    if not msg_ids:
+        print(f"No messages match '{args.query}'.")
+        return
+
+    session = AuthorizedSession(gmail.creds)
+    baseline = None
+    print(f"{'mode':<10} {'wire/msg':>10} {'decoded/msg':>12} {'vs full':>9} {'bodies':>8}")
+    for mode, params in GMAIL_READ_MODES.items():
+        wire_bytes = 0
+        decoded_bytes = 0
+        bodies = 0
+        for msg_id in msg_ids:
+            wire, decoded, message = fetch_raw(session, gmail.service, msg_id, params)
+            wire_bytes += wire
+            decoded_bytes += decoded
+            bodies += bool(_parse_message(message)["body"])
+        per_message = wire_bytes / len(msg_ids)
+        baseline = baseline or per_message
+        print(f"{mode:<10} {per_message:>10.0f} {decoded_bytes / len(msg_ids):>12.0f} "
+              f"{per_message / baseline:>8.1%} {bodies:>5}/{len(msg_ids)}")
+
+
+if __name__ == "__main__":
+    main()
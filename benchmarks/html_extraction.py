@@ -0,0 +1,48 @@
+"""
+Compare HTML-to-text extraction backends over a local corpus of saved pages.
+
+Every *.html / *.htm file in the corpus directory is converted with each
+backend in agentsync.tools.html_extract.EXTRACTORS; throughput and output
+size are reported per backend.
+
+Usage:
+    python -m benchmarks.html_extraction path/to/saved_pages --repeat 3
+"""
+import argparse
+import pathlib
+import time
+from agentsync.tools.html_extract import EXTRACTORS
+
+
+def load_corpus(directory):
+    paths = sorted(p for p in pathlib.Path(directory).rglob("*") if p.suffix.lower() in (".html", ".htm"))
+    return [p.read_text(encoding="utf-8", errors="replace") for p in paths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory of saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per backend")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"No HTML files found in {args.corpus}.")
+        return
+    input_mb = sum(len(page.encode("utf-8")) for page in pages) / 1e6
+    print(f"{len(pages)} pages, {input_mb:.2f} MB of HTML\n")
+
+    print(f"{'backend':<12} {'pages/s':>9} {'MB/s':>8} {'avg chars':>10} {'vs input':>9}")
+    for name, extract in EXTRACTORS.items():
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            outputs = [extract(page) for page in pages]
+        elapsed = (time.perf_counter() - started) / args.repeat
+        output_chars = sum(len(output) for output in outputs)
+        input_chars = sum(len(page) for page in pages)
+        print(f"{name:<12} {len(pages) / elapsed:>9.1f} {input_mb / elapsed:>8.2f} "
+              f"{output_chars / len(pages):>10.0f} {output_chars / input_chars:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measure how long agentsync modules take to import and tool tables take to build.
+
+Every module is imported in a fresh interpreter with ``-X importtime`` and its
+cumulative import time is reported (median over --repeat runs). The startup
+snippets run in a fresh interpreter too and are timed from the first import to
+the returned tool table; none of them should authenticate or touch the network.
+
+With --max-ms the script exits with status 1 when any measurement exceeds the
+budget, so it can guard against startup regressions in CI.
+
+Usage:
+    python -m benchmarks.startup --repeat 5 --max-ms 300
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "agentsync.config",
+    "agentsync.tools",
+    "agentsync.tools.gmail_tool",
+    "agentsync.tools.google_calender_tool",
+    "agentsync.tools.google_sheets_tool",
+    "agentsync.tools.email_verifier_tool",
+    "agentsync.tools.web_search_tool",
+]
+
+# Name -> code timed from the first import until the tools are ready to hand to an agent
+STARTUP_SNIPPETS = {
+    "calendar tool table": (
+        "from agentsync.tools.google_calender_tool import get_calendar_tools\n"
+        "get_calendar_tools()"
+    ),
+    "search tools": (
+        "from agentsync.tools import DuckDuckGoSearchTool, VisitWebpageTool\n"
+        "DuckDuckGoSearchTool(use_cache=False)\n"
+        "VisitWebpageTool(use_cache=False)"
+    ),
+}
+
+TIMER = "import time\n_started = time.perf_counter()\n{code}\nprint((time.perf_counter() - _started) * 1000)"
+
+
+def import_ms(module):
+    """Return the cumulative import time of ``module`` in milliseconds, or None if it fails to import."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return None
+    for line in reversed(completed.stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    return None
+
+
+def snippet_ms(code):
+    completed = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def median_of(measure, repeat):
+    samples = [measure() for _ in range(repeat)]
+    if any(sample is None for sample in samples):
+        return None
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail when any measurement exceeds this")
+    parser.add_argument("--module", action="append", default=[], help="Additional module to measure")
+    args = parser.parse_args()
+
+    results = {}
+    for module in MODULES + args.module:
+        results[module] = median_of(lambda: import_ms(module), args.repeat)
+    for name, code in STARTUP_SNIPPETS.items():
+        results[name] = median_of(lambda: snippet_ms(code), args.repeat)
+
+    failed = []
+    print(f"{'measurement':<40} {'ms':>9}")
+    for name, elapsed in results.items():
+        if elapsed is None:
+            print(f"{name:<40} {'error':>9}")
+            failed.append(name)
+            continue
+        over = args.max_ms is not None and elapsed > args.max_ms
+        print(f"{name:<40} {elapsed:>9.1f}{'  over budget' if over else ''}")
+        if over:
+            failed.append(name)
+
+    if failed:
+        print(f"\n❌ {len(failed)} measurement(s) failed or exceeded the budget: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()